@@ -1,55 +1,56 @@
 """Configuration management for the translation pipeline."""
 
+import functools
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from dotenv import load_dotenv
 
 from settings_manager import load_settings
 
-# Load settings from settings.ini (or run setup wizard if not exists)
-_settings = load_settings()
-
 # ============================================================================
-# CONFIGURATION (now loaded from settings.ini)
+# CONFIGURATION (loaded from settings.ini on first use)
 # ============================================================================
 
-TARGET_LANG = _settings["target_language"]
-TARGET_COL = _settings["target_column"]
-SHEETS_TO_TRAD = _settings["sheets"]
-BATCH_SIZE = _settings["batch_size"]
-BATCH_COOLDOWN_SECONDS = _settings["batch_cooldown_seconds"]
-USE_GEMINI = _settings["provider"] == "gemini"
-EXCEL_FILE = _settings["excel_file"]
-AI_PROMPT = _settings.get("ai_prompt", "")
-
 GEMINI_MODEL = "gemini-2.5-flash-lite"
 OPENAI_MODEL = "gpt-4o-mini"
 
-# Load AI prompt from file if specified in settings
-if not AI_PROMPT and _settings.get("ai_prompt_file"):
-    prompt_file = Path(_settings.get("ai_prompt_file"))
-    if prompt_file.exists():
-        AI_PROMPT = prompt_file.read_text(encoding="utf-8").strip()
+
+def _setting(name: str):
+    """Dataclass field defaulting to a value from settings.ini.
+
+    Settings are read through ``load_settings()``, which caches the parsed file
+    and only re-parses it when settings.ini changes on disk.
+    """
+    return field(default_factory=lambda: load_settings()[name])
+
 
 # ============================================================================
 # END OF CONFIGURATION SECTION
 # ============================================================================
 
 
+@functools.cache
+def _load_dotenv_once() -> None:
+    """Load the .env file into the environment, once per process."""
+    load_dotenv()
+
+
 @dataclass
 class APIConfig:
     """API configuration for OpenAI and Gemini."""
 
-    use_gemini: bool = USE_GEMINI
+    use_gemini: bool = field(default_factory=lambda: load_settings()["provider"] == "gemini")
     gemini_model: str = GEMINI_MODEL
     openai_model: str = OPENAI_MODEL
     gemini_api_key: str = ""
     openai_api_key: str = ""
-    max_retries_openai: int = _settings["max_retries"]
-    max_retries_gemini: int = _settings["max_retries"]
-    rate_limit_wait: float = _settings["rate_limit_wait"]
+    max_retries_openai: int = _setting("max_retries")
+    max_retries_gemini: int = _setting("max_retries")
+    rate_limit_wait: float = _setting("rate_limit_wait")
+    use_batch_api: bool = _setting("use_batch_api")
+    tokens_per_minute: int = _setting("tokens_per_minute")
 
     def validate(self) -> None:
         """Validate that required API keys are configured."""
@@ -66,23 +67,42 @@ class TranslationConfig:
     """Translation settings."""
 
     source_lang: str = "English"
-    target_lang: str = TARGET_LANG
-    target_col: str = TARGET_COL
-    sheets_to_translate: list[str] = None
-    batch_size: int = BATCH_SIZE
-    batch_cooldown_seconds: float = BATCH_COOLDOWN_SECONDS
-    ai_prompt: str = AI_PROMPT
+    target_lang: str = _setting("target_language")
+    target_col: str = _setting("target_column")
+    sheets_to_translate: list[str] = field(default_factory=lambda: load_settings()["sheets"].copy())
+    batch_size: int = _setting("batch_size")
+    batch_cooldown_seconds: float = _setting("batch_cooldown_seconds")
+    max_concurrent_batches: int = _setting("max_concurrent_batches")
+    batches_per_request: int = _setting("batches_per_request")
+    ai_prompt_file: str | None = _setting("ai_prompt_file")
+    _ai_prompt: str | None = field(default=None, init=False, repr=False)
 
-    def __post_init__(self):
-        if self.sheets_to_translate is None:
-            self.sheets_to_translate = SHEETS_TO_TRAD.copy()
+    @property
+    def ai_prompt(self) -> str:
+        """Custom AI prompt, resolved on first access.
+
+        An inline ``ai_prompt`` setting wins; otherwise ``ai_prompt_file`` is read.
+        """
+        if self._ai_prompt is None:
+            self._ai_prompt = load_settings()["ai_prompt"]
+
+            # Load AI prompt from file if specified in settings
+            if not self._ai_prompt and self.ai_prompt_file:
+                prompt_file = Path(self.ai_prompt_file)
+                if prompt_file.exists():
+                    self._ai_prompt = prompt_file.read_text(encoding="utf-8").strip()
+        return self._ai_prompt
+
+    @ai_prompt.setter
+    def ai_prompt(self, value: str) -> None:
+        self._ai_prompt = value
 
 
 @dataclass
 class ExcelConfig:
     """Excel file configuration."""
 
-    excel_path: str = EXCEL_FILE
+    excel_path: str = _setting("excel_file")
     keys_column: str = "Keys"
     comment_column: str = "$comment"
     donottranslate_column: str = "$donottranslate"
@@ -106,14 +126,30 @@ class LoggingConfig:
         self.logs_dir.mkdir(exist_ok=True)
 
 
+@dataclass
+class CacheConfig:
+    """Translation cache configuration."""
+
+    cache_dir: Path = None
+
+    def __post_init__(self):
+        if self.cache_dir is None:
+            self.cache_dir = Path("cache")
+        self.cache_dir.mkdir(exist_ok=True)
+
+    @property
+    def translation_memory_path(self) -> Path:
+        """SQLite file of the translation memory kept across runs."""
+        return self.cache_dir / "translation_memory.sqlite"
+
+
 class Config:
     """Main configuration container."""
 
     def __init__(self):
-        load_dotenv()
+        _load_dotenv_once()
 
         self.api = APIConfig(
-            use_gemini=USE_GEMINI,
             gemini_api_key=os.getenv("GEMINI_API_KEY", ""),
             openai_api_key=os.getenv("OPENAI_API_KEY", ""),
         )
@@ -121,6 +157,7 @@ class Config:
         self.translation = TranslationConfig()
         self.excel = ExcelConfig()
         self.logging = LoggingConfig()
+        self.cache = CacheConfig()
 
         self.api.validate()
 
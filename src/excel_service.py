@@ -1,112 +1,236 @@
 """Excel file operations for reading and writing translations."""
 
+import functools
+import importlib.util
 import logging
 
-import pandas as pd
-from openpyxl import load_workbook
-
 from config import Config
 from models import Segment
 
+# pandas and openpyxl are heavy imports: they are loaded inside the methods that
+# need them so that importing this module stays cheap.
+
+
+@functools.cache
+def _read_engine() -> str | None:
+    """Return the pandas engine used to read sheets.
+
+    The Rust-based calamine reader is much faster than openpyxl and is used when
+    python-calamine is installed; otherwise pandas falls back to its default.
+    """
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return None
+
+
 logger = logging.getLogger(__name__)
 
 
+def _column_with_mask(df, column: str) -> tuple:
+    """Return a column's values and its not-null mask as NumPy arrays.
+
+    A missing column yields no values and an all-False mask.
+    """
+    if column not in df.columns:
+        import numpy as np
+
+        return None, np.zeros(len(df), dtype=bool)
+
+    series = df[column]
+    return series.to_numpy(), series.notna().to_numpy()
+
+
 class ExcelService:
     """Handles reading and writing of Excel localization files."""
 
     def __init__(self, config: Config):
         self.config = config
+        self._sheet_names: tuple[str, ...] | None = None
+        # (sheet_name, column_name) -> 1-based column index; headers don't move during a run
+        self._col_index_cache: dict[tuple[str, str], int] = {}
+        # Writable workbook held open between begin_batch() and commit_batch()
+        self._wb = None
+        # pd.ExcelFile shared by sheet reads until the workbook is saved again
+        self._xl = None
+
+    def _excel_file(self):
+        """Return the open pd.ExcelFile, opening the xlsx on first use.
+
+        Reading every sheet through one ExcelFile unzips the container and parses
+        its shared-strings table once instead of once per sheet.
+        """
+        if self._xl is None:
+            import pandas as pd
+
+            self._xl = pd.ExcelFile(str(self.config.excel.excel_path), engine=_read_engine())
+        return self._xl
+
+    def close(self) -> None:
+        """Release the cached ExcelFile (it is reopened on the next read)."""
+        if self._xl is not None:
+            xl, self._xl = self._xl, None
+            xl.close()
 
     def load_segments_from_sheet(self, sheet_name: str) -> list[Segment]:
-        """Load all segments from an Excel sheet."""
-        df = pd.read_excel(str(self.config.excel.excel_path), sheet_name=sheet_name)
+        """Load the segments of an Excel sheet that the pipeline acts on.
+
+        Only rows that need translating or are marked donottranslate (their
+        source is copied) become segments; rows with a blank source, or an
+        existing translation and no donottranslate mark, are skipped.
+        """
+        import pandas as pd
+
+        df = pd.read_excel(self._excel_file(), sheet_name=sheet_name)
+
+        # Resolve column names once instead of walking the config chain repeatedly
+        key_col = self.config.excel.keys_column
+        src_col = self.config.translation.source_lang
+        tgt_col = self.config.translation.target_col
+        cmt_col = self.config.excel.comment_column
+        dnt_col = self.config.excel.donottranslate_column
 
         # Validate required columns
-        required_cols = [self.config.excel.keys_column, self.config.translation.source_lang]
-        for col in required_cols:
+        for col in (key_col, src_col):
             if col not in df.columns:
                 raise ValueError(f"Missing column '{col}' in sheet '{sheet_name}'")
 
         # Check for optional columns
-        has_target = self.config.translation.target_col in df.columns
-        has_comment = self.config.excel.comment_column in df.columns
-        has_donottranslate = self.config.excel.donottranslate_column in df.columns
-
-        if not has_target:
-            logger.warning(
-                f"[{sheet_name}] Target column '{self.config.translation.target_col}' not found"
-            )
-        if not has_comment:
+        if tgt_col not in df.columns:
+            logger.warning(f"[{sheet_name}] Target column '{tgt_col}' not found")
+        if cmt_col not in df.columns:
             logger.warning(f"[{sheet_name}] Comment column not found")
-        if not has_donottranslate:
+        if dnt_col not in df.columns:
             logger.warning(f"[{sheet_name}] DoNotTranslate column not found")
 
+        # Pull each column out once as a NumPy array, together with a vectorized
+        # not-null mask: indexing arrays is far cheaper than boxing every row into
+        # a Series with df.iterrows() and calling pd.notna() per cell.
+        keys = df[key_col].to_numpy()
+        sources, source_mask = _column_with_mask(df, src_col)
+        targets, target_mask = _column_with_mask(df, tgt_col)
+        comments, comment_mask = _column_with_mask(df, cmt_col)
+        donottranslate_flags, donottranslate_mask = _column_with_mask(df, dnt_col)
+
         segments = []
+        skipped = 0
 
-        for idx, row in df.iterrows():
-            key = str(row[self.config.excel.keys_column])
-            source = (
-                str(row[self.config.translation.source_lang])
-                if pd.notna(row[self.config.translation.source_lang])
-                else ""
-            )
-            target = (
-                str(row[self.config.translation.target_col])
-                if (has_target and pd.notna(row[self.config.translation.target_col]))
-                else ""
-            )
-            comment = (
-                str(row[self.config.excel.comment_column])
-                if (has_comment and pd.notna(row[self.config.excel.comment_column]))
-                else ""
-            )
+        for i in range(len(df)):
+            source = str(sources[i]) if source_mask[i] else ""
+            if not source or source.isspace():
+                skipped += 1
+                continue
 
             donottranslate = False
-            if has_donottranslate and pd.notna(row[self.config.excel.donottranslate_column]):
-                donot = str(row[self.config.excel.donottranslate_column]).strip().lower()
+            if donottranslate_mask[i]:
+                donot = str(donottranslate_flags[i]).strip().lower()
                 donottranslate = donot != ""
 
+            target = str(targets[i]) if target_mask[i] else ""
+            if target and not target.isspace() and not donottranslate:
+                skipped += 1
+                continue
+
             seg = Segment(
                 sheet=sheet_name,
-                row_idx=idx + 2,  # header row = 1
-                key=key,
+                row_idx=i + 2,  # header row = 1
+                key=str(keys[i]),
                 source_text=source,
                 existing_target=target,
-                comment=comment,
+                comment=str(comments[i]) if comment_mask[i] else "",
                 donottranslate=donottranslate,
             )
             segments.append(seg)
 
-        logger.info(f"[{sheet_name}] Loaded {len(segments)} segments")
+        logger.info(
+            f"[{sheet_name}] Loaded {len(segments)} segments "
+            f"({skipped} rows already translated or empty)"
+        )
         return segments
 
+    def load_segments_for_all_sheets(self, sheet_names: list[str]) -> dict[str, list[Segment]]:
+        """Load segments for several sheets, in order.
+
+        Every sheet is read through the one cached ExcelFile, so the xlsx is
+        unzipped and its shared strings parsed once for the whole workbook.
+        """
+        return {name: self.load_segments_from_sheet(name) for name in sheet_names}
+
     def find_column_index(self, ws, target_col_name: str) -> int:
         """Find column index by header name."""
-        header_row = 1
-        for col in range(1, ws.max_column + 1):
-            if ws.cell(row=header_row, column=col).value == target_col_name:
+        # Read the header row's values in one pass instead of one cell lookup per column
+        headers = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        for col, value in enumerate(headers, start=1):
+            if value == target_col_name:
                 return col
         return -1
 
     def ensure_column_exists(self, ws, target_col_name: str) -> int:
         """Ensure target column exists, create if needed."""
+        cache_key = (ws.title, target_col_name)
+        if cache_key in self._col_index_cache:
+            return self._col_index_cache[cache_key]
+
         col_index = self.find_column_index(ws, target_col_name)
-        if col_index != -1:
-            return col_index
+        if col_index == -1:
+            # Create new column
+            col_index = ws.max_column + 1
+            ws.cell(row=1, column=col_index, value=target_col_name)
+            logger.warning(f"[Excel] Created column '{target_col_name}' at column {col_index}")
+
+        self._col_index_cache[cache_key] = col_index
+        return col_index
+
+    def begin_batch(self) -> None:
+        """Open the workbook once and keep writes in memory until commit_batch()."""
+        if self._wb is None:
+            from openpyxl import load_workbook
 
-        # Create new column
-        new_col = ws.max_column + 1
-        ws.cell(row=1, column=new_col, value=target_col_name)
-        logger.warning(f"[Excel] Created column '{target_col_name}' at column {new_col}")
-        return new_col
+            self._wb = load_workbook(str(self.config.excel.excel_path))
+
+    def commit_batch(self) -> None:
+        """Save the batched workbook to disk (a single save for all writes)."""
+        if self._wb is None:
+            return
+
+        wb, self._wb = self._wb, None
+        # The cached ExcelFile holds the xlsx open, which blocks replacing it on Windows
+        self.close()
+        self._save(wb)
+        logger.info("[Excel] Saved workbook")
+
+    def _save(self, wb) -> None:
+        """Save a workbook over the Excel file without ever leaving it half-written.
+
+        openpyxl writes the zip in place, so a crash mid-save would corrupt the
+        only copy; the workbook goes to a sibling file that then replaces it.
+        The cached ExcelFile must be closed first (see close()).
+        """
+        path = self.config.excel.excel_path_obj
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            wb.save(str(tmp_path))
+            tmp_path.replace(path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
     def write_translations(self, sheet_name: str, translations: dict[int, str]) -> None:
-        """Write translations to Excel file."""
+        """Write translations to Excel file.
+
+        Inside a begin_batch()/commit_batch() pair the write only touches the
+        in-memory workbook; otherwise the workbook is loaded and saved here.
+        """
         if not translations:
             logger.info(f"[{sheet_name}] No translations to write")
             return
 
-        wb = load_workbook(str(self.config.excel.excel_path))
+        batched = self._wb is not None
+        if batched:
+            wb = self._wb
+        else:
+            from openpyxl import load_workbook
+
+            wb = load_workbook(str(self.config.excel.excel_path))
         ws = wb[sheet_name]
 
         col_index = self.ensure_column_exists(ws, self.config.translation.target_col)
@@ -114,10 +238,22 @@ class ExcelService:
         for row_idx, text in translations.items():
             ws.cell(row=row_idx, column=col_index, value=text)
 
-        wb.save(str(self.config.excel.excel_path))
+        if not batched:
+            self.close()
+            self._save(wb)
         logger.info(f"[{sheet_name}] Wrote {len(translations)} translations to Excel")
 
-    def get_existing_sheets(self) -> set:
-        """Get list of all sheet names in the workbook."""
-        wb = load_workbook(str(self.config.excel.excel_path))
-        return set(wb.sheetnames)
+    def get_sheet_names(self) -> tuple[str, ...]:
+        """Get all sheet names, in workbook order.
+
+        The names come from the shared ExcelFile, so the sheets read next reuse
+        the container it has already opened; they are cached for the rest of
+        the run.
+        """
+        if self._sheet_names is None:
+            self._sheet_names = tuple(self._excel_file().sheet_names)
+        return self._sheet_names
+
+    def get_existing_sheets(self) -> frozenset[str]:
+        """Get the set of all sheet names in the workbook."""
+        return frozenset(self.get_sheet_names())
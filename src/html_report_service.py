@@ -1,81 +1,31 @@
 """HTML report generation for translation results."""
 
 import csv
+import sys
+from collections import Counter, defaultdict
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 
-
-class HTMLReportService:
-    """Generate HTML reports for translation results."""
-
-    @staticmethod
-    def generate_report(keys_log_path: Path, run_id: str, config) -> Path:
-        """Generate an HTML report from the keys log CSV file."""
-
-        # Parse CSV data
-        stats = HTMLReportService._parse_csv(keys_log_path)
-
-        # Create HTML
-        html_path = keys_log_path.parent / f"mt_report_{run_id}.html"
-        html_content = HTMLReportService._build_html(stats, run_id, config)
-
-        # Write file
-        with html_path.open("w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        return html_path
-
-    @staticmethod
-    def _parse_csv(keys_log_path: Path) -> dict:
-        """Parse the keys log CSV and extract statistics."""
-        stats = {"total": 0, "by_status": {}, "by_sheet": {}, "all_rows": []}
-
-        if not keys_log_path.exists():
-            return stats
-
-        with keys_log_path.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                stats["all_rows"].append(row)
-                stats["total"] += 1
-
-                status = row.get("status", "UNKNOWN")
-                stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
-
-                sheet = row.get("sheet", "Unknown")
-                if sheet not in stats["by_sheet"]:
-                    stats["by_sheet"][sheet] = {"total": 0, "by_status": {}}
-                stats["by_sheet"][sheet]["total"] += 1
-                stats["by_sheet"][sheet]["by_status"][status] = (
-                    stats["by_sheet"][sheet]["by_status"].get(status, 0) + 1
-                )
-
-        return stats
-
-    @staticmethod
-    def _build_html(stats: dict, run_id: str, config) -> str:
-        """Build the HTML report."""
-
-        # Color mapping for status
-        status_colors = {
-            "OK": "#10b981",
-            "NO_TRANSLATION": "#f59e0b",
-            "MISSING_TOKENS": "#ef4444",
-            "TOKENS_OUT_OF_ORDER": "#ef4444",
-            "COPIED_SOURCE": "#6366f1",
-        }
-
-        # Calculate percentages
-        total = stats["total"]
-        ok_count = stats["by_status"].get("OK", 0)
-        ok_percent = (ok_count / total * 100) if total > 0 else 0
-
-        # Build status summary HTML
-        status_summary = ""
-        for status, count in sorted(stats["by_status"].items()):
-            color = status_colors.get(status, "#6b7280")
-            percent = (count / total * 100) if total > 0 else 0
-            status_summary += f"""
+# Color mapping for status (keys are interned, like the statuses read from the log)
+STATUS_COLORS = {
+    sys.intern("OK"): "#10b981",
+    sys.intern("OK_CACHED"): "#14b8a6",
+    sys.intern("NO_TRANSLATION"): "#f59e0b",
+    sys.intern("MISSING_TOKENS"): "#ef4444",
+    sys.intern("TOKENS_OUT_OF_ORDER"): "#ef4444",
+    sys.intern("COPIED_SOURCE"): "#6366f1",
+}
+DEFAULT_STATUS_COLOR = "#6b7280"
+
+# Statuses counted as successful translations
+SUCCESS_STATUSES = ("OK", "OK_CACHED")
+
+# Keys logs larger than this are summarized with pandas' C parser
+PANDAS_CSV_THRESHOLD_BYTES = 10 * 1024 * 1024
+
+# Repeated HTML fragments, filled with str.format and joined once per section
+_STATUS_ITEM_TEMPLATE = """
             <div class="status-item">
                 <span class="status-badge" style="background-color: {color};">{status}</span>
                 <span class="status-count">{count} segments</span>
@@ -83,19 +33,12 @@ class HTMLReportService:
             </div>
             """
 
-        # Build per-sheet breakdown
-        sheets_breakdown = ""
-        for sheet, sheet_stats in sorted(stats["by_sheet"].items()):
-            sheet_total = sheet_stats["total"]
-            sheet_ok = sheet_stats["by_status"].get("OK", 0)
-            sheet_ok_percent = (sheet_ok / sheet_total * 100) if sheet_total > 0 else 0
+_STATUS_TAG_TEMPLATE = (
+    '<span class="status-tag" style="background-color: {color}20; color: {color}; '
+    'border: 1px solid {color};">{status}: {count}</span>'
+)
 
-            status_details = ""
-            for status, count in sorted(sheet_stats["by_status"].items()):
-                color = status_colors.get(status, "#6b7280")
-                status_details += f'<span class="status-tag" style="background-color: {color}20; color: {color}; border: 1px solid {color};">{status}: {count}</span>'
-
-            sheets_breakdown += f"""
+_SHEET_ROW_TEMPLATE = """
             <tr>
                 <td class="sheet-name">{sheet}</td>
                 <td>{sheet_total}</td>
@@ -110,124 +53,129 @@ class HTMLReportService:
             </tr>
             """
 
-        html = f"""<!DOCTYPE html>
+
+# Static page shell. Only the small dynamic sections go through format_map; the
+# stylesheet is a plain constant and is never scanned for placeholders.
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Translation Report - {run_id}</title>
     <style>
-        * {{
+"""
+
+_HTML_STYLE = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
-        }}
+        }
 
-        .header {{
+        .header {
             background: white;
             border-radius: 10px;
             padding: 30px;
             margin-bottom: 20px;
             box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-        }}
+        }
 
-        .header h1 {{
+        .header h1 {
             color: #1f2937;
             font-size: 32px;
             margin-bottom: 10px;
-        }}
+        }
 
-        .header p {{
+        .header p {
             color: #6b7280;
             font-size: 14px;
-        }}
+        }
 
-        .summary {{
+        .summary {
             background: white;
             border-radius: 10px;
             padding: 30px;
             margin-bottom: 20px;
             box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-        }}
+        }
 
-        .summary-grid {{
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
 
-        .summary-card {{
+        .summary-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             border-radius: 8px;
             padding: 20px;
             color: white;
             text-align: center;
-        }}
+        }
 
-        .summary-card.success {{
+        .summary-card.success {
             background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        }}
+        }
 
-        .summary-card.warning {{
+        .summary-card.warning {
             background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-        }}
+        }
 
-        .summary-card.error {{
+        .summary-card.error {
             background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        }}
+        }
 
-        .summary-card h3 {{
+        .summary-card h3 {
             font-size: 14px;
             font-weight: 600;
             opacity: 0.9;
             margin-bottom: 10px;
-        }}
+        }
 
-        .summary-card .value {{
+        .summary-card .value {
             font-size: 32px;
             font-weight: 700;
-        }}
+        }
 
-        .summary-card .percent {{
+        .summary-card .percent {
             font-size: 14px;
             opacity: 0.8;
             margin-top: 5px;
-        }}
+        }
 
-        .status-summary {{
+        .status-summary {
             background: #f9fafb;
             border-radius: 8px;
             padding: 20px;
             margin-bottom: 20px;
-        }}
+        }
 
-        .status-summary h3 {{
+        .status-summary h3 {
             color: #1f2937;
             font-size: 16px;
             margin-bottom: 15px;
             font-weight: 600;
-        }}
+        }
 
-        .status-items {{
+        .status-items {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 10px;
-        }}
+        }
 
-        .status-item {{
+        .status-item {
             background: white;
             border-radius: 6px;
             padding: 12px;
@@ -235,9 +183,9 @@ class HTMLReportService:
             display: flex;
             align-items: center;
             gap: 10px;
-        }}
+        }
 
-        .status-badge {{
+        .status-badge {
             display: inline-block;
             padding: 4px 8px;
             border-radius: 4px;
@@ -246,99 +194,99 @@ class HTMLReportService:
             font-weight: 600;
             min-width: 100px;
             text-align: center;
-        }}
+        }
 
-        .status-count {{
+        .status-count {
             color: #1f2937;
             font-weight: 600;
             flex: 1;
-        }}
+        }
 
-        .status-percent {{
+        .status-percent {
             color: #6b7280;
             font-size: 12px;
             min-width: 50px;
             text-align: right;
-        }}
+        }
 
-        .sheets-breakdown {{
+        .sheets-breakdown {
             background: white;
             border-radius: 10px;
             padding: 30px;
             box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
             overflow-x: auto;
-        }}
+        }
 
-        .sheets-breakdown h3 {{
+        .sheets-breakdown h3 {
             color: #1f2937;
             font-size: 18px;
             margin-bottom: 20px;
             font-weight: 600;
-        }}
+        }
 
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
-        }}
+        }
 
-        thead {{
+        thead {
             background: #f9fafb;
             border-bottom: 2px solid #e5e7eb;
-        }}
+        }
 
-        th {{
+        th {
             padding: 12px;
             text-align: left;
             color: #1f2937;
             font-weight: 600;
             font-size: 14px;
-        }}
+        }
 
-        td {{
+        td {
             padding: 12px;
             border-bottom: 1px solid #e5e7eb;
             color: #374151;
             font-size: 14px;
-        }}
+        }
 
-        tbody tr:hover {{
+        tbody tr:hover {
             background: #f9fafb;
-        }}
+        }
 
-        .sheet-name {{
+        .sheet-name {
             font-weight: 600;
             color: #1f2937;
-        }}
+        }
 
-        .progress-bar {{
+        .progress-bar {
             background: #e5e7eb;
             border-radius: 4px;
             height: 24px;
             overflow: hidden;
             position: relative;
             margin-bottom: 5px;
-        }}
+        }
 
-        .progress-fill {{
+        .progress-fill {
             height: 100%;
             transition: width 0.3s ease;
-        }}
+        }
 
-        .status-tags {{
+        .status-tags {
             display: flex;
             gap: 5px;
             flex-wrap: wrap;
-        }}
+        }
 
-        .status-tag {{
+        .status-tag {
             display: inline-block;
             padding: 4px 8px;
             border-radius: 4px;
             font-size: 11px;
             font-weight: 500;
-        }}
+        }
 
-        .footer {{
+        .footer {
             background: white;
             border-radius: 10px;
             padding: 20px;
@@ -347,9 +295,9 @@ class HTMLReportService:
             color: #6b7280;
             font-size: 12px;
             box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-        }}
+        }
 
-        .config-info {{
+        .config-info {
             background: #f3f4f6;
             border-radius: 6px;
             padding: 15px;
@@ -357,41 +305,43 @@ class HTMLReportService:
             color: #4b5563;
             line-height: 1.6;
             margin-top: 15px;
-        }}
+        }
 
-        .config-info strong {{
+        .config-info strong {
             color: #1f2937;
-        }}
+        }
 
-        @media (max-width: 768px) {{
-            .header h1 {{
+        @media (max-width: 768px) {
+            .header h1 {
                 font-size: 24px;
-            }}
+            }
 
-            .summary-grid {{
+            .summary-grid {
                 grid-template-columns: 1fr;
-            }}
+            }
 
-            .status-items {{
+            .status-items {
                 grid-template-columns: 1fr;
-            }}
+            }
 
-            table {{
+            table {
                 font-size: 12px;
-            }}
+            }
 
-            th, td {{
+            th, td {
                 padding: 8px;
-            }}
-        }}
-    </style>
+            }
+        }
+"""
+
+_HTML_SUMMARY = """    </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>Translation Report</h1>
             <p>Tennis Manager Localization Translation</p>
-            <p>Report ID: <strong>{run_id}</strong> | Generated: <strong>{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</strong></p>
+            <p>Report ID: <strong>{run_id}</strong> | Generated: <strong>{generated}</strong></p>
         </div>
 
         <div class="summary">
@@ -407,26 +357,28 @@ class HTMLReportService:
                 </div>
                 <div class="summary-card warning">
                     <h3>Warnings</h3>
-                    <div class="value">{stats["by_status"].get("NO_TRANSLATION", 0)}</div>
+                    <div class="value">{warning_count}</div>
                 </div>
                 <div class="summary-card error">
                     <h3>Errors</h3>
-                    <div class="value">{stats["by_status"].get("MISSING_TOKENS", 0) + stats["by_status"].get("TOKENS_OUT_OF_ORDER", 0)}</div>
+                    <div class="value">{error_count}</div>
                 </div>
             </div>
 
             <div class="status-summary">
                 <h3>Status Breakdown</h3>
                 <div class="status-items">
-                    {status_summary}
+                    """
+
+_HTML_CONFIG = """
                 </div>
             </div>
 
             <div class="config-info">
                 <strong>Configuration:</strong><br>
-                Target Language: {config.translation.target_lang}<br>
-                Batch Size: {config.translation.batch_size}<br>
-                Sheets: {", ".join(config.translation.sheets_to_translate)}
+                Target Language: {target_lang}<br>
+                Batch Size: {batch_size}<br>
+                Sheets: {sheets}
             </div>
         </div>
 
@@ -443,7 +395,9 @@ class HTMLReportService:
                     </tr>
                 </thead>
                 <tbody>
-                    {sheets_breakdown}
+                    """
+
+_HTML_TAIL = """
                 </tbody>
             </table>
         </div>
@@ -455,4 +409,180 @@ class HTMLReportService:
 </body>
 </html>
 """
-        return html
+
+
+def _field(row: list[str], idx: int | None, default: str) -> str:
+    """Return ``row[idx]``, or ``default`` when the column is absent or the row is short."""
+    if idx is None or idx >= len(row):
+        return default
+    return row[idx]
+
+
+class HTMLReportService:
+    """Generate HTML reports for translation results."""
+
+    @staticmethod
+    def generate_report(keys_log_path: Path, run_id: str, config) -> Path:
+        """Generate an HTML report from the keys log CSV file."""
+
+        # Parse CSV data
+        stats = HTMLReportService._parse_csv(keys_log_path)
+
+        # Stream HTML chunks straight into a large write buffer
+        html_path = keys_log_path.parent / f"mt_report_{run_id}.html"
+        with html_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+            f.writelines(HTMLReportService._render_html(stats, run_id, config))
+
+        return html_path
+
+    @staticmethod
+    def _parse_csv(keys_log_path: Path) -> dict:
+        """Parse the keys log CSV and extract statistics."""
+        stats = {
+            "total": 0,
+            "by_status": Counter(),
+            "by_sheet": defaultdict(lambda: {"total": 0, "by_status": Counter()}),
+        }
+
+        if not keys_log_path.exists():
+            return stats
+
+        if keys_log_path.stat().st_size > PANDAS_CSV_THRESHOLD_BYTES:
+            HTMLReportService._count_with_pandas(keys_log_path, stats)
+            return stats
+
+        with keys_log_path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return stats
+
+            # Resolve column positions once; rows are then indexed as plain lists
+            status_idx = header.index("status") if "status" in header else None
+            sheet_idx = header.index("sheet") if "sheet" in header else None
+
+            for row in reader:
+                stats["total"] += 1
+
+                # Interned so repeated statuses share one object and dict lookups
+                # hit the identity fast path
+                status = sys.intern(_field(row, status_idx, "UNKNOWN"))
+                stats["by_status"][status] += 1
+
+                sheet_stats = stats["by_sheet"][_field(row, sheet_idx, "Unknown")]
+                sheet_stats["total"] += 1
+                sheet_stats["by_status"][status] += 1
+
+        return stats
+
+    @staticmethod
+    def _count_with_pandas(keys_log_path: Path, stats: dict) -> None:
+        """Fill ``stats`` from a large keys log using vectorized pandas counts."""
+        import pandas as pd
+
+        with keys_log_path.open("r", encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f), [])
+        if not header:
+            return
+
+        # Only the grouping columns are parsed; fall back to the first column so
+        # rows are still counted when neither is present
+        usecols = [col for col in ("sheet", "status") if col in header] or [header[0]]
+        df = pd.read_csv(
+            keys_log_path,
+            usecols=usecols,
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8",
+        )
+        # Same fallbacks as the csv path when a column is absent
+        status = df["status"].fillna("UNKNOWN") if "status" in df else "UNKNOWN"
+        sheet = df["sheet"].fillna("Unknown") if "sheet" in df else "Unknown"
+        df = pd.DataFrame({"sheet": sheet, "status": status}, index=df.index).astype("category")
+
+        stats["total"] = len(df)
+        for status, count in df["status"].value_counts().items():
+            if count:
+                stats["by_status"][sys.intern(status)] = int(count)
+
+        counts = df.groupby(["sheet", "status"], observed=True).size()
+        for (sheet, status), count in counts.items():
+            sheet_stats = stats["by_sheet"][sheet]
+            sheet_stats["total"] += int(count)
+            sheet_stats["by_status"][sys.intern(status)] = int(count)
+
+    @staticmethod
+    def _build_html(stats: dict, run_id: str, config) -> str:
+        """Build the HTML report."""
+        return "".join(HTMLReportService._render_html(stats, run_id, config))
+
+    @staticmethod
+    def _render_html(stats: dict, run_id: str, config) -> Iterator[str]:
+        """Yield the HTML report in chunks, in document order."""
+
+        # Calculate percentages
+        total = stats["total"]
+        ok_count = sum(stats["by_status"].get(status, 0) for status in SUCCESS_STATUSES)
+        ok_percent = (ok_count / total * 100) if total > 0 else 0
+
+        # Build status summary HTML
+        status_items = [
+            _STATUS_ITEM_TEMPLATE.format(
+                color=STATUS_COLORS.get(status, DEFAULT_STATUS_COLOR),
+                status=status,
+                count=count,
+                percent=(count / total * 100) if total > 0 else 0,
+            )
+            for status, count in sorted(stats["by_status"].items())
+        ]
+
+        # Build per-sheet breakdown
+        sheet_rows = []
+        for sheet, sheet_stats in sorted(stats["by_sheet"].items()):
+            sheet_total = sheet_stats["total"]
+            sheet_ok = sum(sheet_stats["by_status"].get(status, 0) for status in SUCCESS_STATUSES)
+
+            status_details = "".join(
+                _STATUS_TAG_TEMPLATE.format(
+                    color=STATUS_COLORS.get(status, DEFAULT_STATUS_COLOR),
+                    status=status,
+                    count=count,
+                )
+                for status, count in sorted(sheet_stats["by_status"].items())
+            )
+
+            sheet_rows.append(
+                _SHEET_ROW_TEMPLATE.format(
+                    sheet=sheet,
+                    sheet_total=sheet_total,
+                    sheet_ok=sheet_ok,
+                    sheet_ok_percent=(sheet_ok / sheet_total * 100) if sheet_total > 0 else 0,
+                    status_details=status_details,
+                )
+            )
+
+        by_status = stats["by_status"]
+        yield _HTML_HEAD.format_map({"run_id": run_id})
+        yield _HTML_STYLE
+        yield _HTML_SUMMARY.format_map(
+            {
+                "run_id": run_id,
+                "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "ok_count": ok_count,
+                "ok_percent": ok_percent,
+                "total": total,
+                "warning_count": by_status.get("NO_TRANSLATION", 0),
+                "error_count": by_status.get("MISSING_TOKENS", 0)
+                + by_status.get("TOKENS_OUT_OF_ORDER", 0),
+            }
+        )
+        yield from status_items
+        yield _HTML_CONFIG.format_map(
+            {
+                "target_lang": config.translation.target_lang,
+                "batch_size": config.translation.batch_size,
+                "sheets": ", ".join(config.translation.sheets_to_translate),
+            }
+        )
+        yield from sheet_rows
+        yield _HTML_TAIL
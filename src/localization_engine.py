@@ -1,93 +1,244 @@
 """Main orchestration engine for the translation pipeline."""
 
+import asyncio
+import csv
+import functools
 import logging
-import time
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING, TextIO, TypeVar
 
 from rich.console import Console
-from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
 
 from config import Config
 from excel_service import ExcelService
-from html_report_service import HTMLReportService
 from models import Segment
+from rate_limiter import RateLimiter
+from tm_cache import TranslationMemoryCache
 from translation_service import TranslationService
 from utils import PlaceholderManager
 from validation_service import ValidationService
 
+# rich.progress and the report service are imported where they are used, keeping
+# engine import (and CLI start-up) cheap
+if TYPE_CHECKING:
+    from google.genai import client as genai_client
+    from openai import AsyncOpenAI
+    from rich.progress import Progress
+
 logger = logging.getLogger(__name__)
-console = Console()
+
+# Distinct source texts whose placeholder scan is memoized per run
+PLACEHOLDER_CACHE_SIZE = 50_000
+
+# Rough tokens one batch's segments may take in a request and its answer; long
+# texts close a batch before batch_size is reached, keeping the answer well
+# inside the models' output limits
+BATCH_TOKEN_BUDGET = 6_000
+
+T = TypeVar("T")
 
 
 class LocalizationEngine:
     """Main orchestrator for the translation pipeline."""
 
-    def __init__(self, config: Config, keys_log_path: Path):
+    def __init__(
+        self,
+        config: Config,
+        keys_log_path: Path,
+        rate_limiter: RateLimiter | None = None,
+        translation_cache: TranslationMemoryCache | None = None,
+        async_client: "genai_client.AsyncClient | AsyncOpenAI | None" = None,
+        keys_log: TextIO | None = None,
+        console: Console | None = None,
+    ):
         self.config = config
+        # Run messages and progress bars go to the caller's console when given one
+        self.console = console if console is not None else Console()
         self.keys_log_path = keys_log_path
         self.excel_service = ExcelService(config)
-        self.translation_service = TranslationService(config)
+        # Shared by all in-flight requests: request starts are spaced by the provider's
+        # reported quota (batch_cooldown_seconds when it sends none) and kept under
+        # tokens_per_minute, while max_concurrent_batches bounds how many are in flight
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(
+                config.translation.batch_cooldown_seconds, config.api.tokens_per_minute
+            )
+        self.rate_limiter = rate_limiter
         self.validation_service = ValidationService()
+        # Opened once per run (see open_keys_log) and closed by whoever opened it:
+        # the caller for a log passed in, otherwise the engine when the run ends
+        self._owns_log = keys_log is None
+        self._log_fh = keys_log if keys_log is not None else self.open_keys_log(keys_log_path)
+        self._log_writer = csv.writer(self._log_fh, lineterminator="\n")
+        self._target_lang = config.translation.target_lang
+        self._use_batch_api = config.api.use_batch_api and not config.api.use_gemini
+        # Validated translations of previously seen segments, reused within the run
+        # and persisted across runs; closed when the run ends if the engine opened it
+        self._owns_cache = translation_cache is None
+        if translation_cache is None:
+            translation_cache = TranslationMemoryCache(config.cache.translation_memory_path)
+            translation_cache.load()
+        self.translation_cache = translation_cache
+        # Memoized PlaceholderManager.protect: request building, validation, gap-fill
+        # retries and repeated strings reuse the scan. The returned maps are shared,
+        # and only ever read.
+        self._protect = functools.lru_cache(maxsize=PLACEHOLDER_CACHE_SIZE)(
+            PlaceholderManager.protect
+        )
+        # Requests are built from the same memoized scans the engine validates with
+        self.translation_service = TranslationService(
+            config,
+            rate_limiter=self.rate_limiter,
+            protect=self._protect,
+            async_client=async_client,
+        )
 
     def run(self) -> None:
-        """Execute the full translation pipeline."""
+        """Execute the full translation pipeline from synchronous code.
+
+        Starts an event loop for run_async(); callers that already have one
+        await run_async() directly.
+        """
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
+        """Execute the full translation pipeline on the running event loop.
+
+        Sheets are processed concurrently, and their API requests are sent
+        through the provider's async client, at most max_concurrent_batches at a
+        time across all sheets; everything else runs on the loop's thread.
+        """
+        self._in_flight = asyncio.Semaphore(self.config.translation.max_concurrent_batches)
         logger.info(f"=== Starting translation for {self.config.translation.target_lang} ===")
         run_id = self.keys_log_path.stem.split("_", 2)[-1]  # Extract run_id from filename
 
         try:
-            existing_sheets = self.excel_service.get_existing_sheets()
-            total_translated = 0
-            total_gaps_filled = 0
-
+            # Follow the workbook's own sheet order so sheets are read in file order
+            requested_sheets = frozenset(self.config.translation.sheets_to_translate)
             sheets_to_process = [
-                s for s in self.config.translation.sheets_to_translate if s in existing_sheets
+                s for s in self.excel_service.get_sheet_names() if s in requested_sheets
             ]
 
             if not sheets_to_process:
-                console.print("[bold red] No valid sheets to process[/bold red]")
+                self.console.print("[bold red] No valid sheets to process[/bold red]")
                 logger.error("No valid sheets to process")
                 return
 
             # Main translation phase
-            console.print(
+            self.console.print(
                 f"\n[bold cyan] Starting translation ({len(sheets_to_process)} sheets)[/bold cyan]"
             )
-            for sheet_name in sheets_to_process:
-                translated = self._translate_sheet(sheet_name)
-                total_translated += translated
-
-            console.print(f"[green] Translated {total_translated} segments[/green]\n")
-            logger.info(f"Total segments translated: {total_translated}")
-
-            # Gap-filling phase
-            console.print("[bold cyan] Starting gap-filling phase[/bold cyan]")
-            for sheet_name in sheets_to_process:
-                gaps_filled = self._fill_gaps_in_sheet(sheet_name)
-                total_gaps_filled += gaps_filled
+            sheet_segments = self.excel_service.load_segments_for_all_sheets(sheets_to_process)
+
+            # Both phases write into one in-memory workbook, saved once at the end,
+            # and share one progress display with a task per sheet and phase
+            self.excel_service.begin_batch()
+            try:
+                with self._new_progress() as progress:
+                    translated_rows = await self._for_each_sheet(
+                        sheets_to_process,
+                        lambda name: self._translate_sheet(name, sheet_segments[name], progress),
+                    )
+                    total_translated = sum(len(rows) for rows in translated_rows.values())
+
+                    self.console.print(f"[green] Translated {total_translated} segments[/green]\n")
+                    logger.info(f"Total segments translated: {total_translated}")
+
+                    # Gap-filling phase: gaps are found from the segments already in memory
+                    self.console.print("[bold cyan] Starting gap-filling phase[/bold cyan]")
+                    gaps_filled = await self._for_each_sheet(
+                        sheets_to_process,
+                        lambda name: self._fill_gaps_in_sheet(
+                            name, sheet_segments[name], translated_rows[name], progress
+                        ),
+                    )
+                    total_gaps_filled = sum(gaps_filled.values())
+            finally:
+                self.excel_service.commit_batch()
 
             if total_gaps_filled > 0:
-                console.print(f"[green] Filled {total_gaps_filled} gaps[/green]\n")
+                self.console.print(f"[green] Filled {total_gaps_filled} gaps[/green]\n")
             else:
-                console.print("[yellow] No gaps found[/yellow]\n")
+                self.console.print("[yellow] No gaps found[/yellow]\n")
 
             logger.info(f"Total gaps filled: {total_gaps_filled}")
             logger.info("=== Translation complete ===")
 
             # Generate HTML report
+            from html_report_service import HTMLReportService
+
+            # The log is complete: sync it to disk once, not per row or batch
+            self._flush_log()
+            os.fsync(self._log_fh.fileno())
             html_path = HTMLReportService.generate_report(self.keys_log_path, run_id, self.config)
             logger.info(f"HTML report generated: {html_path}")
 
         except Exception as e:
-            console.print(f"[bold red] Fatal error: {e}[/bold red]")
+            self.console.print(f"[bold red] Fatal error: {e}[/bold red]")
             logger.error(f"[Main] Fatal error: {e}", exc_info=True)
             raise
 
-    def _translate_sheet(self, sheet_name: str) -> int:
-        """Translate a single sheet."""
+        finally:
+            # The one place an engine-opened keys log is closed, whether the run
+            # succeeded or not; a caller's log is left open for the caller
+            if self._owns_log:
+                self._log_fh.close()
+            else:
+                self._flush_log()
+            if self._owns_cache:
+                self.translation_cache.close()
+            else:
+                self.translation_cache.save()
+            self.translation_service.close()
+            await self.translation_service.aclose()
+
+    @staticmethod
+    async def _for_each_sheet(
+        sheet_names: list[str], process: Callable[[str], Awaitable[T]]
+    ) -> dict[str, T]:
+        """Run ``process`` for every sheet concurrently and collect the results by sheet.
+
+        The shared rate limiter and request limit keep the combined request rate
+        where a single sheet's would be. If a sheet fails, the others are
+        cancelled and its error is raised as is.
+        """
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = {name: tg.create_task(process(name)) for name in sheet_names}
+        except ExceptionGroup as group:
+            raise group.exceptions[0] from None
+        return {name: task.result() for name, task in tasks.items()}
+
+    def _new_progress(self) -> "Progress":
+        """Progress display shared by every sheet and phase of a run."""
+        from rich.progress import (
+            BarColumn,
+            MofNCompleteColumn,
+            Progress,
+            TextColumn,
+            TimeRemainingColumn,
+        )
+
+        return Progress(
+            TextColumn("{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeRemainingColumn(),
+            console=self.console,
+        )
+
+    async def _translate_sheet(
+        self, sheet_name: str, segments: list[Segment], progress: "Progress"
+    ) -> dict[int, str]:
+        """Translate a single sheet from its loaded segments.
+
+        Returns:
+            Dict mapping row_idx -> text written to the target column
+        """
         logger.info(f"--- Processing sheet '{sheet_name}' ---")
 
-        # Load segments
-        segments = self.excel_service.load_segments_from_sheet(sheet_name)
         segments_to_translate = [s for s in segments if s.needs_translation()]
         donottranslate_segments = [
             s for s in segments if s.donottranslate and s.source_text and s.source_text.strip()
@@ -95,7 +246,7 @@ class LocalizationEngine:
 
         if not segments_to_translate and not donottranslate_segments:
             logger.info(f"[{sheet_name}] No segments to process")
-            return 0
+            return {}
 
         logger.debug(
             f"[{sheet_name}] {len(segments_to_translate)} segments to translate, {len(donottranslate_segments)} donottranslate"
@@ -115,103 +266,215 @@ class LocalizationEngine:
 
         # Then, translate remaining segments
         if segments_to_translate:
-            batches = self._build_batches(segments_to_translate)
-            logger.debug(f"[{sheet_name}] {len(batches)} batches created")
-
-            with Progress(
-                TextColumn(f"[cyan]{sheet_name}[/cyan]"),
-                BarColumn(),
-                MofNCompleteColumn(),
-                TimeRemainingColumn(),
-                console=console,
-            ) as progress:
-                task = progress.add_task(f"Translating {sheet_name}", total=len(batches))
-
-                for i, batch in enumerate(batches, start=1):
-                    logger.debug(
-                        f"[{sheet_name}] Processing batch {i}/{len(batches)} ({len(batch)} segments)"
-                    )
-
-                    try:
-                        batch_translations = self._process_batch(sheet_name, batch)
-                        all_translations.update(batch_translations)
-
-                        progress.update(task, advance=1)
-
-                        # Cooldown between batches
-                        if i < len(batches):
-                            logger.debug(
-                                f"[{sheet_name}] Cooldown {self.config.translation.batch_cooldown_seconds}s..."
-                            )
-                            time.sleep(self.config.translation.batch_cooldown_seconds)
-
-                    except Exception as e:
-                        logger.error(f"[{sheet_name}] Batch {i} failed: {e}")
-                        progress.update(task, advance=1)
-                        # Continue with next batch instead of stopping
-                        continue
+            unique, repeats = self._dedupe(segments_to_translate)
+            batches = list(self._iter_batches(unique))
+            logger.debug(f"[{sheet_name}] {len(batches)} batches to process")
+
+            task = progress.add_task(f"[cyan]{sheet_name}[/cyan]", total=len(batches))
+            try:
+                async for batch_translations in self._dispatch_batches(
+                    sheet_name, batches, repeats
+                ):
+                    all_translations.update(batch_translations)
+                    progress.update(task, advance=1)
+            finally:
+                progress.remove_task(task)
 
         # Write to Excel
         if all_translations:
             self.excel_service.write_translations(sheet_name, all_translations)
 
         logger.info(f"[{sheet_name}] Processed {len(all_translations)} segments")
-        return len(all_translations)
+        return all_translations
+
+    async def _dispatch_batches(
+        self,
+        sheet_name: str,
+        batches: list[list[Segment]],
+        repeats: dict[str, list[Segment]],
+    ) -> AsyncIterator[dict[int, str]]:
+        """Process batches of segments, yielding each batch's translations as it completes.
+
+        Consecutive batches are grouped ``batches_per_request`` at a time into one
+        API request (with the Batch API, all of them into one job), and up to
+        ``max_concurrent_batches`` requests of all sheets are in flight at once.
+        Results are consumed one at a time on the loop, so Excel writes never
+        happen concurrently. A failed batch yields an empty result so progress still
+        advances.
+        """
+        if self._use_batch_api:
+            # One Batch API job per sheet and phase
+            groups = [batches]
+        else:
+            per_request = self.config.translation.batches_per_request
+            groups = [batches[i : i + per_request] for i in range(0, len(batches), per_request)]
+        in_flight = self._in_flight
+
+        async def process_group(i: int, group: list[list[Segment]]) -> list[dict[int, str]]:
+            async with in_flight:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"[{sheet_name}] Sending request {i}/{len(groups)} "
+                        f"({len(group)} batches, {sum(len(b) for b in group)} segments)"
+                    )
+                try:
+                    return await self._process_batches(sheet_name, group, repeats)
+                except Exception as e:
+                    logger.error(f"[{sheet_name}] Request of {len(group)} batches failed: {e}")
+                    # Continue with the other batches instead of stopping
+                    return [{} for _ in group]
 
-    def _process_batch(self, sheet_name: str, batch: list[Segment]) -> dict[int, str]:
-        """Process a single batch of segments."""
-        result = {}
+        tasks = [
+            asyncio.create_task(process_group(i, group)) for i, group in enumerate(groups, start=1)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                group_translations = await next_done
+                self._flush_log()
+                self.translation_cache.save()
+                for batch_translations in group_translations:
+                    yield batch_translations
+        finally:
+            # Only left early on an error: stop the requests nobody will read
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _process_batches(
+        self,
+        sheet_name: str,
+        batches: list[list[Segment]],
+        repeats: dict[str, list[Segment]],
+    ) -> list[dict[int, str]]:
+        """Process consecutive batches of segments with a single API request.
+
+        Segments already in the translation memory are served from it. Each
+        outcome also applies to the segment's repeats (see _dedupe), which are
+        never sent themselves.
+
+        Returns:
+            One dict mapping row_idx -> translated text per batch
+        """
+        results: list[dict[int, str]] = [{} for _ in batches]
+
+        # Bind what the per-segment loops use to locals once per request; per-key debug
+        # messages are only formatted when debug logging is on
+        translation_cache = self.translation_cache
+        cache_key = self._cache_key
+        protect = self._protect
+        validate = self.validation_service.validate_translation
+        restore = PlaceholderManager.restore
+        log_key = self._log_key
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         try:
-            # Get translations from API
-            translations = self.translation_service.translate_batch(batch)
-
-            # Process each segment
-            for seg in batch:
-                translated_text = translations.get(seg.key, "")
-
-                if not translated_text or not translated_text.strip():
-                    logger.debug(f"[MT] No translation for key={seg.key}")
-                    self._log_key(seg.sheet, seg.key, seg.row_idx, "NO_TRANSLATION")
-                    continue
-
-                # Validate placeholders
-                _protected_source, placeholder_map = PlaceholderManager.protect(seg.source_text)
-                validation = self.validation_service.validate_translation(
-                    seg, translated_text, placeholder_map
-                )
-
-                if not validation.is_valid:
-                    logger.warning(
-                        f"[MT] Validation failed for key={seg.key}: "
-                        f"missing={validation.missing_tokens}, out_of_order={validation.out_of_order}"
+            # Snapshot cache hits now, keeping each batch's new segments together as
+            # one sub-request
+            keys_per_batch: list[list[str]] = []
+            cached: dict[str, str] = {}
+            pending: list[dict[str, Segment]] = []
+            for batch in batches:
+                keys = [cache_key(seg) for seg in batch]
+                keys_per_batch.append(keys)
+                batch_pending: dict[str, Segment] = {}
+                for seg, key in zip(batch, keys, strict=True):
+                    cached_text = translation_cache.get(key)
+                    if cached_text is not None:
+                        cached[key] = cached_text
+                    else:
+                        batch_pending[key] = seg
+                if batch_pending:
+                    pending.append(batch_pending)
+
+            # cache key -> raw translation from this API call
+            translated_by_key: dict[str, str] = {}
+            if pending:
+                to_send = [list(batch_pending.values()) for batch_pending in pending]
+                if self._use_batch_api:
+                    # The job is polled with blocking calls, kept off the event loop
+                    translations = await asyncio.to_thread(
+                        self.translation_service.translate_with_batch_api, to_send
                     )
-                    self._log_key(
-                        seg.sheet,
-                        seg.key,
-                        seg.row_idx,
-                        "TOKENS_OUT_OF_ORDER" if validation.out_of_order else "MISSING_TOKENS",
+                else:
+                    # Get translations from API, respecting the shared request pacing
+                    await self.rate_limiter.wait_async(
+                        self.translation_service.estimate_tokens(to_send)
                     )
-                    continue
-
-                # Restore placeholders and store result
-                final_text = PlaceholderManager.restore(translated_text, placeholder_map)
-                result[seg.row_idx] = final_text
+                    translations = await self.translation_service.translate_megabatch_async(to_send)
+                for batch_pending, batch_translations in zip(pending, translations, strict=True):
+                    for key, seg in batch_pending.items():
+                        translated_by_key[key] = batch_translations.get(seg.key, "")
+
+            # Process each segment, fanning its outcome out to its repeats
+            for result, batch, keys in zip(results, batches, keys_per_batch, strict=True):
+                for seg, key in zip(batch, keys, strict=True):
+                    if key in cached:
+                        translated_text = cached[key]
+                        status = "OK_CACHED"
+                    else:
+                        translated_text = translated_by_key.get(key, "")
+                        status = "OK"
+
+                    if not translated_text or translated_text.isspace():
+                        if debug:
+                            logger.debug(f"[MT] No translation for key={seg.key}")
+                        for target in (seg, *repeats.get(key, ())):
+                            log_key(target.sheet, target.key, target.row_idx, "NO_TRANSLATION")
+                        continue
 
-                logger.debug(f"[MT] Translated key={seg.key} row={seg.row_idx}")
-                self._log_key(seg.sheet, seg.key, seg.row_idx, "OK")
+                    # Repeats share the protected source but not necessarily the
+                    # placeholders behind its tokens, so each is validated and
+                    # restored with its own map
+                    for target in (seg, *repeats.get(key, ())):
+                        _protected_source, placeholder_map = protect(target.source_text)
+                        validation = validate(
+                            target, translated_text, source_token_map=placeholder_map
+                        )
+
+                        if not validation.is_valid:
+                            logger.warning(
+                                f"[MT] Validation failed for key={target.key}: "
+                                f"missing={list(validation.missing_tokens)}, "
+                                f"out_of_order={validation.out_of_order}"
+                            )
+                            target_status = (
+                                "TOKENS_OUT_OF_ORDER"
+                                if validation.out_of_order
+                                else "MISSING_TOKENS"
+                            )
+                        else:
+                            # Restore placeholders and remember the translation
+                            result[target.row_idx] = restore(translated_text, placeholder_map)
+                            if target is seg:
+                                translation_cache.put(key, translated_text)
+                            target_status = status
+                            if debug:
+                                logger.debug(
+                                    f"[MT] Translated key={target.key} "
+                                    f"row={target.row_idx} ({status})"
+                                )
+                        log_key(target.sheet, target.key, target.row_idx, target_status)
 
         except Exception as e:
             logger.error(f"[Batch] Error processing batch: {e}")
 
-        return result
+        return results
 
-    def _fill_gaps_in_sheet(self, sheet_name: str) -> int:
-        """Find and fill gaps in a sheet."""
+    async def _fill_gaps_in_sheet(
+        self,
+        sheet_name: str,
+        segments: list[Segment],
+        translated_rows: dict[int, str],
+        progress: "Progress",
+    ) -> int:
+        """Find and fill gaps in a sheet.
+
+        A gap is a segment that still needs translation and got no text in the
+        main phase; segments are not re-read from the workbook.
+        """
         logger.debug(f"[Verify] Checking for gaps in '{sheet_name}'...")
 
-        segments = self.excel_service.load_segments_from_sheet(sheet_name)
-        gaps = [s for s in segments if s.needs_translation()]
+        gaps = [s for s in segments if s.needs_translation() and s.row_idx not in translated_rows]
 
         if not gaps:
             logger.debug(f"[Verify] No gaps in '{sheet_name}'")
@@ -219,55 +482,104 @@ class LocalizationEngine:
 
         logger.info(f"[Verify] Found {len(gaps)} gaps in '{sheet_name}', attempting to fill...")
 
-        gap_batches = self._build_batches(gaps)
-        total_filled = 0
-
-        with Progress(
-            TextColumn(f"[yellow]{sheet_name} (gaps)[/yellow]"),
-            BarColumn(),
-            MofNCompleteColumn(),
-            console=console,
-        ) as progress:
-            task = progress.add_task(f"Filling gaps in {sheet_name}", total=len(gap_batches))
+        all_gap_translations = {}
 
-            for i, batch in enumerate(gap_batches, start=1):
-                logger.debug(f"[Verify] Gap batch {i}/{len(gap_batches)}")
+        unique, repeats = self._dedupe(gaps)
+        batches = list(self._iter_batches(unique))
+        task = progress.add_task(f"[yellow]{sheet_name} (gaps)[/yellow]", total=len(batches))
+        try:
+            async for gap_translations in self._dispatch_batches(sheet_name, batches, repeats):
+                all_gap_translations.update(gap_translations)
+                progress.update(task, advance=1)
+        finally:
+            progress.remove_task(task)
 
-                try:
-                    gap_translations = self._process_batch(sheet_name, batch)
+        # Write the whole sheet's gap translations at once, like the main phase
+        if all_gap_translations:
+            self.excel_service.write_translations(sheet_name, all_gap_translations)
 
-                    if gap_translations:
-                        self.excel_service.write_translations(sheet_name, gap_translations)
-                        total_filled += len(gap_translations)
+        total_filled = len(all_gap_translations)
+        logger.info(f"[Verify] Filled {total_filled} gaps in '{sheet_name}'")
+        return total_filled
 
-                    progress.update(task, advance=1)
+    def _cache_key(self, seg: Segment) -> str:
+        """Translation memory key of the request a segment would make."""
+        return self.translation_cache.make_key(
+            self.config.translation.source_lang,
+            self._target_lang,
+            seg.sheet,
+            self._protect(seg.source_text)[0],
+            seg.comment,
+            self.translation_service.prompt_fingerprint,
+        )
 
-                    if i < len(gap_batches):
-                        time.sleep(self.config.translation.batch_cooldown_seconds)
+    def _dedupe(self, segments: list[Segment]) -> tuple[list[Segment], dict[str, list[Segment]]]:
+        """Split segments into the first of each distinct request and its repeats.
+
+        Segments with the same cache key (same sheet, comment and protected
+        source) would send the model the same request, so only the first one is
+        batched and the others take its tokenized translation, restored with
+        their own placeholders.
+
+        Returns:
+            Tuple of (segments to send, in order; cache key -> repeated segments)
+        """
+        cache_key = self._cache_key
+        unique: list[Segment] = []
+        repeats: dict[str, list[Segment]] = {}
+        seen: set[str] = set()
+        for seg in segments:
+            key = cache_key(seg)
+            if key in seen:
+                repeats.setdefault(key, []).append(seg)
+            else:
+                seen.add(key)
+                unique.append(seg)
 
-                except Exception as e:
-                    logger.error(f"[Verify] Gap batch {i} failed: {e}")
-                    progress.update(task, advance=1)
-                    continue
+        if repeats:
+            logger.debug(f"[MT] {len(segments) - len(unique)} repeated source texts not sent")
+        return unique, repeats
 
-        logger.info(f"[Verify] Filled {total_filled} gaps in '{sheet_name}'")
-        return total_filled
+    def _iter_batches(self, segments: list[Segment]) -> Iterator[list[Segment]]:
+        """Yield consecutive segments in batches of at most batch_size.
 
-    def _build_batches(self, segments: list[Segment]) -> list[list[Segment]]:
-        """Split segments into batches."""
-        batches = []
+        A batch is also closed early once its segments would exceed
+        BATCH_TOKEN_BUDGET; a single segment over the budget gets a batch of
+        its own.
+        """
         batch_size = self.config.translation.batch_size
+        segment_tokens = self.translation_service.segment_tokens
+
+        batch: list[Segment] = []
+        batch_tokens = 0
+        for seg in segments:
+            tokens = segment_tokens(seg)
+            if batch and (len(batch) == batch_size or batch_tokens + tokens > BATCH_TOKEN_BUDGET):
+                yield batch
+                batch = []
+                batch_tokens = 0
+            batch.append(seg)
+            batch_tokens += tokens
+        if batch:
+            yield batch
+
+    @staticmethod
+    def open_keys_log(keys_log_path: Path) -> TextIO:
+        """Open the keys log for buffered appending, writing the header if new."""
+        is_new_file = not keys_log_path.exists()
+
+        fh = keys_log_path.open("a", encoding="utf-8", newline="", buffering=1 << 16)
+        if is_new_file:
+            csv.writer(fh, lineterminator="\n").writerow(
+                ("sheet", "key", "row_idx", "target_lang", "status")
+            )
+        return fh
 
-        for i in range(0, len(segments), batch_size):
-            batches.append(segments[i : i + batch_size])
-
-        return batches
+    def _flush_log(self) -> None:
+        """Push buffered key-log lines to disk (done once per batch)."""
+        self._log_fh.flush()
 
     def _log_key(self, sheet: str, key: str, row_idx: int, status: str) -> None:
-        """Log translation status for a key."""
-        is_new_file = not self.keys_log_path.exists()
-
-        with self.keys_log_path.open("a", encoding="utf-8") as f:
-            if is_new_file:
-                f.write("sheet,key,row_idx,target_lang,status\n")
-            f.write(f"{sheet},{key},{row_idx},{self.config.translation.target_lang},{status}\n")
+        """Log translation status for a key (called on the event loop's thread only)."""
+        # csv.writer quotes keys containing commas, quotes or newlines
+        self._log_writer.writerow((sheet, key, row_idx, self._target_lang, status))
@@ -1,11 +1,11 @@
 """Data models for the translation pipeline."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Segment:
-    """A single translatable segment from Excel."""
+    """A single translatable segment from Excel (immutable, so it is hashable)."""
 
     sheet: str
     row_idx: int
@@ -17,14 +17,17 @@ class Segment:
 
     def needs_translation(self) -> bool:
         """Check if this segment should be translated."""
-        if not self.source_text or not self.source_text.strip():
-            return False
-        if self.donottranslate:
-            return False
-        return not (self.existing_target and self.existing_target.strip())
+        # isspace() is False for "", so "non-blank" is `s and not s.isspace()`,
+        # which avoids allocating a stripped copy of each string
+        return (
+            not self.donottranslate
+            and bool(self.source_text)
+            and not self.source_text.isspace()
+            and (not self.existing_target or self.existing_target.isspace())
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class TranslationResult:
     """Result of a translation operation."""
 
@@ -38,14 +41,14 @@ class TranslationResult:
         return self.status == "OK"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ValidationReport:
     """Report of validation checks on translated text."""
 
     key: str
-    source_tokens: list = field(default_factory=list)
-    target_tokens: list = field(default_factory=list)
-    missing_tokens: list = field(default_factory=list)
+    source_tokens: tuple[str, ...] = ()
+    target_tokens: tuple[str, ...] = ()
+    missing_tokens: tuple[str, ...] = ()
     out_of_order: bool = False
 
     @property
@@ -0,0 +1,231 @@
+"""Thread-safe pacing of API requests."""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+# Durations as sent in x-ratelimit-reset-* headers: "20ms", "1s", "6m0s", "1h2m3.5s"
+DURATION_PART_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)", re.ASCII)
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Extra spacing after a rate-limit error: doubled on each one (starting from the
+# step), reduced by the recovery on each successful response, never above the cap
+THROTTLE_STEP_SECONDS = 1.0
+THROTTLE_RECOVERY_SECONDS = 0.25
+THROTTLE_MAX_SECONDS = 60.0
+
+# Span of the sliding window a configured tokens_per_minute budget is counted over
+TOKEN_WINDOW_SECONDS = 60.0
+
+
+def parse_duration(value: str) -> float | None:
+    """Parse a rate-limit reset duration into seconds, or None if unrecognized."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = DURATION_PART_PATTERN.findall(value)
+    if not parts or "".join(num + unit for num, unit in parts) != value:
+        return None
+    return sum(float(num) * DURATION_UNITS[unit] for num, unit in parts)
+
+
+@dataclass(slots=True)
+class RateLimitInfo:
+    """Remaining request and token quota reported by the provider."""
+
+    remaining: int | None = None
+    reset_seconds: float | None = None
+    remaining_tokens: int | None = None
+    tokens_reset_seconds: float | None = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str] | None) -> "RateLimitInfo":
+        """Read the x-ratelimit-* headers, ignoring missing or malformed values."""
+        info = cls()
+        if not headers:
+            return info
+
+        lowered = {name.lower(): value for name, value in headers.items()}
+        remaining = lowered.get("x-ratelimit-remaining-requests")
+        reset = lowered.get("x-ratelimit-reset-requests")
+        remaining_tokens = lowered.get("x-ratelimit-remaining-tokens")
+        tokens_reset = lowered.get("x-ratelimit-reset-tokens")
+
+        if remaining is not None and remaining.strip().isdigit():
+            info.remaining = int(remaining)
+        if reset is not None:
+            info.reset_seconds = parse_duration(reset)
+        if remaining_tokens is not None and remaining_tokens.strip().isdigit():
+            info.remaining_tokens = int(remaining_tokens)
+        if tokens_reset is not None:
+            info.tokens_reset_seconds = parse_duration(tokens_reset)
+        return info
+
+
+def backoff_delay(
+    attempt: int, base: float = 1.0, cap: float = 60.0, retry_after: float | None = None
+) -> float:
+    """Seconds to wait before retry ``attempt`` (1-based).
+
+    A server-provided Retry-After wins; otherwise the delay is drawn uniformly
+    from [0, min(cap, base * 2**(attempt - 1))] ("full jitter"), so callers
+    throttled at the same moment do not all retry at the same moment.
+    """
+    if retry_after is not None:
+        return max(0.0, retry_after)
+    return random.uniform(0.0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def retry_after(error: Exception) -> float | None:
+    """Server-requested retry delay carried by an API error, if any.
+
+    Reads the Retry-After / retry-after-ms response headers (OpenAI) and the
+    RetryInfo ``retryDelay`` in the error details (Gemini RESOURCE_EXHAUSTED).
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if hasattr(headers, "get"):
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+        value = headers.get("retry-after")
+        if value is not None:
+            seconds = parse_duration(value)
+            if seconds is not None:
+                return seconds
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    details = getattr(error, "details", None)
+    if isinstance(details, Mapping):
+        for detail in details.get("error", {}).get("details", ()):
+            if isinstance(detail, Mapping) and "retryDelay" in detail:
+                return parse_duration(str(detail["retryDelay"]))
+    return None
+
+
+class RateLimiter:
+    """Space request starts at least ``min_interval`` seconds apart.
+
+    The limiter is shared by every in-flight request, so the request rate stays
+    the same no matter how many batches are in flight at once. When the provider
+    reports its remaining quota (see ``observe``), the spacing adapts to it and
+    ``min_interval`` is only the fallback. A reported token quota is spent by
+    each request's estimated token count, and a request that would overdraw it
+    waits for the token reset. A configured ``tokens_per_minute`` also caps the
+    tokens started over any sliding minute, so a run stays under the quota
+    before (or without) the provider reporting it. Rate-limit errors (see
+    ``throttled``) widen the spacing multiplicatively; successful responses
+    narrow it again linearly.
+    """
+
+    def __init__(self, min_interval: float, tokens_per_minute: int = 0):
+        self.min_interval = max(0.0, min_interval)
+        self.interval = self.min_interval
+        self.throttle = 0.0
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        # Tokens left until the reported token quota resets; None when unknown
+        self._token_budget: int | None = None
+        self._tokens_reset_at = 0.0
+        # (start, tokens) of the requests started within the last window, oldest first
+        self._window: deque[tuple[float, int]] = deque()
+        self._window_tokens = 0
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve the next start slot and return how long until it comes."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+
+            if self._token_budget is not None:
+                if slot >= self._tokens_reset_at:
+                    # The quota has refilled; the next response reports it again
+                    self._token_budget = None
+                elif tokens > self._token_budget:
+                    slot = self._tokens_reset_at
+                    self._token_budget = None
+                else:
+                    self._token_budget -= tokens
+
+            if self.tokens_per_minute and tokens:
+                slot = self._window_slot(slot, tokens)
+
+            self._next_slot = slot + self.interval + self.throttle
+        return slot - now
+
+    def _window_slot(self, slot: float, tokens: int) -> float:
+        """Earliest start from ``slot`` at which ``tokens`` fit the per-minute budget.
+
+        Records the request in the window; called with the lock held. A request
+        larger than the whole budget starts once the window is empty.
+        """
+        window = self._window
+        while window and (
+            window[0][0] <= slot - TOKEN_WINDOW_SECONDS
+            or self._window_tokens + tokens > self.tokens_per_minute
+        ):
+            started, spent = window.popleft()
+            self._window_tokens -= spent
+            slot = max(slot, started + TOKEN_WINDOW_SECONDS)
+
+        window.append((slot, tokens))
+        self._window_tokens += tokens
+        return slot
+
+    def wait(self, tokens: int = 0) -> None:
+        """Block until the caller may start a request of about ``tokens`` tokens."""
+        # Sleep outside the lock so other threads can reserve the following slots
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, tokens: int = 0) -> None:
+        """Like wait(), but yields to the event loop instead of blocking."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def throttled(self) -> None:
+        """Slow every caller down after the provider rejected a request as rate limited."""
+        with self._lock:
+            self.throttle = min(THROTTLE_MAX_SECONDS, max(THROTTLE_STEP_SECONDS, self.throttle * 2))
+
+    def observe(self, info: RateLimitInfo) -> None:
+        """Adapt the spacing to the quota reported with the last response.
+
+        The remaining requests are spread evenly over the time left until the
+        quota resets; with no quota left, nothing starts before the reset.
+        Without usable headers the fixed ``min_interval`` applies. Each response
+        also relaxes the extra spacing left by earlier rate-limit errors.
+        """
+        with self._lock:
+            self.throttle = max(0.0, self.throttle - THROTTLE_RECOVERY_SECONDS)
+
+            if info.remaining_tokens is not None and info.tokens_reset_seconds is not None:
+                self._token_budget = info.remaining_tokens
+                self._tokens_reset_at = time.monotonic() + info.tokens_reset_seconds
+            else:
+                self._token_budget = None
+
+            if info.remaining is None or info.reset_seconds is None:
+                self.interval = self.min_interval
+            elif info.remaining > 0:
+                self.interval = info.reset_seconds / info.remaining
+            else:
+                self.interval = self.min_interval
+                self._next_slot = max(self._next_slot, time.monotonic() + info.reset_seconds)
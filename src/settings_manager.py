@@ -1,8 +1,10 @@
 """Settings management with INI file and interactive setup wizard."""
 
 import configparser
+import re
 from pathlib import Path
 
+from rich.columns import Columns
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
@@ -47,22 +49,93 @@ AVAILABLE_SHEETS = [
     "MP_TUTO",
 ]
 
+# Lookup tables for validating and resolving sheet names
+AVAILABLE_SHEETS_SET = frozenset(AVAILABLE_SHEETS)
+AVAILABLE_SHEETS_BY_LOWER = {s.lower(): s for s in AVAILABLE_SHEETS}
+
+
+class FastConfigParser:
+    """Minimal regex-based INI reader for settings.ini.
+
+    Covers the subset of the INI format written by the setup wizard:
+    ``[Section]`` headers, ``key = value`` options and full-line ``#`` / ``;``
+    comments. Option names are case-insensitive, as with ConfigParser.
+
+    Not supported: multi-line values, ``%(name)s`` interpolation, ``key: value``
+    syntax, inline comments and DEFAULT section inheritance.
+    """
+
+    SECTION_PATTERN = re.compile(r"^\[([^\]]+)\]\s*$")
+    OPTION_PATTERN = re.compile(r"^([^=;#]+?)\s*=\s*(.*)$")
+    # Same spellings as ConfigParser.getboolean()
+    BOOLEAN_STATES = configparser.ConfigParser.BOOLEAN_STATES
+
+    def __init__(self):
+        self._sections: dict[str, dict[str, str]] = {}
+
+    def read(self, path: Path) -> None:
+        """Read and parse an INI file."""
+        self.read_string(path.read_text(encoding="utf-8"))
+
+    def read_string(self, text: str) -> None:
+        """Parse INI content from a string."""
+        section = None
+        for line_no, raw_line in enumerate(text.splitlines(), 1):
+            line = raw_line.strip()
+            if not line or line[0] in "#;":
+                continue
+
+            if match := self.SECTION_PATTERN.match(line):
+                section = self._sections.setdefault(match.group(1).strip(), {})
+                continue
+
+            match = self.OPTION_PATTERN.match(line)
+            if match is None or section is None:
+                raise ValueError(f"Invalid line {line_no} in settings file: {raw_line!r}")
+            section[match.group(1).lower()] = match.group(2)
+
+    def has_option(self, section: str, option: str) -> bool:
+        return option.lower() in self._sections.get(section, {})
+
+    def get(self, section: str, option: str) -> str:
+        try:
+            return self._sections[section][option.lower()]
+        except KeyError:
+            raise ValueError(f"Missing option '{option}' in section [{section}]") from None
+
+    def getint(self, section: str, option: str) -> int:
+        return int(self.get(section, option))
+
+    def getfloat(self, section: str, option: str) -> float:
+        return float(self.get(section, option))
+
+    def getboolean(self, section: str, option: str) -> bool:
+        value = self.get(section, option).strip().lower()
+        if value in self.BOOLEAN_STATES:
+            return self.BOOLEAN_STATES[value]
+        raise ValueError(f"Not a boolean for '{option}' in section [{section}]: {value!r}")
+
 
 class SettingsManager:
     """Manage translation settings from INI file."""
 
     def __init__(self):
-        self.config = configparser.ConfigParser()
+        self.config = FastConfigParser()
         self.settings_path = SETTINGS_FILE
+        self._settings: dict | None = None
 
     def load(self) -> dict:
-        """Load settings from INI file."""
+        """Load settings from INI file (parsed once per manager, as UTF-8)."""
+        if self._settings is not None:
+            return self._settings
+
         if not self.settings_path.exists():
             console.print("[yellow]settings.ini not found. Running setup wizard...[/yellow]\n")
             self.run_setup_wizard()
 
         self.config.read(self.settings_path)
-        return self._parse_config()
+        self._settings = self._parse_config()
+        return self._settings
 
     def _parse_config(self) -> dict:
         """Parse INI config into settings dictionary."""
@@ -89,6 +162,34 @@ class SettingsManager:
         else:
             settings["ai_prompt"] = ""
 
+        # Optional: number of batches sent to the API at the same time
+        if self.config.has_option("Translation", "max_concurrent_batches"):
+            settings["max_concurrent_batches"] = self.config.getint(
+                "Translation", "max_concurrent_batches"
+            )
+        else:
+            settings["max_concurrent_batches"] = 1
+
+        # Optional: number of batches packed into one API request
+        if self.config.has_option("Translation", "batches_per_request"):
+            settings["batches_per_request"] = self.config.getint(
+                "Translation", "batches_per_request"
+            )
+        else:
+            settings["batches_per_request"] = 1
+
+        # Optional: send requests through the OpenAI Batch API
+        if self.config.has_option("API", "use_batch_api"):
+            settings["use_batch_api"] = self.config.getboolean("API", "use_batch_api")
+        else:
+            settings["use_batch_api"] = False
+
+        # Optional: tokens started per minute at most (0: only the provider's reported quota)
+        if self.config.has_option("API", "tokens_per_minute"):
+            settings["tokens_per_minute"] = self.config.getint("API", "tokens_per_minute")
+        else:
+            settings["tokens_per_minute"] = 0
+
         self._validate_settings(settings)
         return settings
 
@@ -106,7 +207,7 @@ class SettingsManager:
         if not settings["sheets"]:
             raise ValueError("At least one sheet must be selected")
 
-        invalid_sheets = [s for s in settings["sheets"] if s not in AVAILABLE_SHEETS]
+        invalid_sheets = [s for s in settings["sheets"] if s not in AVAILABLE_SHEETS_SET]
         if invalid_sheets:
             raise ValueError(f"Invalid sheets: {invalid_sheets}. Available: {AVAILABLE_SHEETS}")
 
@@ -114,14 +215,26 @@ class SettingsManager:
         if settings["batch_size"] < 1 or settings["batch_size"] > 100:
             raise ValueError("batch_size must be between 1 and 100")
 
+        # Validate concurrency
+        if settings["max_concurrent_batches"] < 1:
+            raise ValueError("max_concurrent_batches must be at least 1")
+        if settings["batches_per_request"] < 1:
+            raise ValueError("batches_per_request must be at least 1")
+
         # Validate provider
         if settings["provider"] not in ["gemini", "openai"]:
             raise ValueError("provider must be 'gemini' or 'openai'")
 
+        if settings["use_batch_api"] and settings["provider"] != "openai":
+            raise ValueError("use_batch_api is only supported with provider = openai")
+
         # Validate retries
         if settings["max_retries"] < 1:
             raise ValueError("max_retries must be at least 1")
 
+        if settings["tokens_per_minute"] < 0:
+            raise ValueError("tokens_per_minute cannot be negative")
+
     def run_setup_wizard(self) -> None:
         """Interactive setup wizard for first-time configuration."""
         title = Text("Tennis Manager Translation - Initial Setup", style="bold cyan")
@@ -140,8 +253,13 @@ class SettingsManager:
 
         # Sheets Selection
         console.print("\n[bold]Available Sheets:[/bold]")
-        for i, sheet in enumerate(AVAILABLE_SHEETS, 1):
-            console.print(f"  {i:2}. {sheet}")
+        console.print(
+            Columns(
+                [f"{i:2}. {sheet}" for i, sheet in enumerate(AVAILABLE_SHEETS, 1)],
+                equal=True,
+                expand=True,
+            )
+        )
 
         sheets_input = Prompt.ask(
             "[bold]Sheets to translate[/bold] (comma-separated)",
@@ -198,14 +316,14 @@ class SettingsManager:
                 pass
 
             # Try as sheet name
-            if item in AVAILABLE_SHEETS:
+            if item in AVAILABLE_SHEETS_SET:
                 sheets.append(item)
                 continue
 
-            # If nothing worked, try to find partial match
-            matches = [s for s in AVAILABLE_SHEETS if s.lower() == item.lower()]
-            if matches:
-                sheets.append(matches[0])
+            # If nothing worked, try a case-insensitive match
+            match = AVAILABLE_SHEETS_BY_LOWER.get(item.lower())
+            if match:
+                sheets.append(match)
                 continue
 
             console.print(f"[yellow]Warning: Sheet '{item}' not found, skipping[/yellow]")
@@ -224,6 +342,8 @@ class SettingsManager:
             "sheets": ", ".join(sheets),
             "batch_size": str(batch_size),
             "batch_cooldown_seconds": "22.0",
+            "max_concurrent_batches": "1",
+            "batches_per_request": "1",
             "# ai_prompt_file": "custom_prompt.txt",
         }
 
@@ -231,17 +351,49 @@ class SettingsManager:
             "provider": provider,
             "max_retries": "5",
             "rate_limit_wait": "25.0",
+            "use_batch_api": "false",
+            "tokens_per_minute": "0",
         }
 
         config["Excel"] = {
             "excel_file": "localization.xlsx",
         }
 
-        with self.settings_path.open("w") as f:
+        with self.settings_path.open("w", encoding="utf-8") as f:
             config.write(f)
+        self._settings = None
+
+
+# Parsed settings, keyed by the (mtime, size) fingerprint of the file they came from
+_settings_cache: tuple[tuple[int, int], dict] | None = None
+
+
+def _settings_fingerprint() -> tuple[int, int] | None:
+    """Return the (mtime, size) fingerprint of settings.ini, or None if missing."""
+    try:
+        stat = SETTINGS_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 def load_settings() -> dict:
-    """Load settings from INI file (create if needed)."""
+    """Load settings from INI file (create if needed).
+
+    The parsed settings are cached and returned as-is until settings.ini
+    changes on disk, so repeated calls only cost a ``stat()``.
+    """
+    global _settings_cache
+
+    fingerprint = _settings_fingerprint()
+    if (
+        fingerprint is not None
+        and _settings_cache is not None
+        and _settings_cache[0] == fingerprint
+    ):
+        return _settings_cache[1]
+
     manager = SettingsManager()
-    return manager.load()
+    settings = manager.load()
+    _settings_cache = (_settings_fingerprint(), settings)
+    return settings
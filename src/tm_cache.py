@@ -0,0 +1,157 @@
+"""Persistent translation memory keyed by segment content."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Entries kept across runs; the least recently used are dropped beyond this
+TM_CACHE_MAX_ENTRIES = 200_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS translations_used ON translations (used);
+"""
+
+
+class TranslationMemoryCache:
+    """Size-bounded LRU map of segment fingerprints to validated translations.
+
+    A key hashes everything that shapes the request for one segment: the
+    language pair, the sheet (which sets the tone in the prompt), the segment's
+    comment, the model and prompt in use, and the placeholder-protected source
+    text. A hit therefore stands for the exact request the API would otherwise
+    see again, and changing the model or prompt starts a fresh memory. Values
+    are raw model output, placeholders still tokenized.
+
+    Entries live in an SQLite database, committed by ``save()``, so the
+    translations of a run survive even if a later request crashes it. Safe to
+    share between threads.
+    """
+
+    def __init__(self, path: Path, max_entries: int = TM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._count = 0
+        # Recency counter: every get hit and put stamps its entry with the next value
+        self._clock = 0
+
+    @staticmethod
+    def make_key(
+        source_lang: str,
+        target_lang: str,
+        sheet: str,
+        protected_source: str,
+        comment: str = "",
+        prompt: str = "",
+    ) -> str:
+        """Fingerprint of one translation request.
+
+        ``prompt`` identifies the model and system prompt; see
+        TranslationService.prompt_fingerprint.
+        """
+        data = f"{prompt}|{source_lang}|{target_lang}|{sheet}|{comment}|{protected_source}"
+        return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._connect()
+            return self._count
+
+    def get(self, key: str) -> str | None:
+        """Cached translation for a key, marking it as recently used."""
+        with self._lock:
+            db = self._connect()
+            row = db.execute("SELECT text FROM translations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._clock += 1
+            db.execute("UPDATE translations SET used = ? WHERE key = ?", (self._clock, key))
+            return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        """Store a translation, evicting the least recently used entries if full."""
+        with self._lock:
+            db = self._connect()
+            self._clock += 1
+            is_new = (
+                db.execute("SELECT 1 FROM translations WHERE key = ?", (key,)).fetchone() is None
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO translations (key, text, used) VALUES (?, ?, ?)",
+                (key, text, self._clock),
+            )
+            if is_new:
+                self._count += 1
+
+            if self._count > self.max_entries:
+                db.execute(
+                    "DELETE FROM translations WHERE key IN "
+                    "(SELECT key FROM translations ORDER BY used LIMIT ?)",
+                    (self._count - self.max_entries,),
+                )
+                self._count = self.max_entries
+
+    def load(self) -> None:
+        """Open the entries saved by previous runs; an unreadable file is ignored."""
+        with self._lock:
+            self._connect()
+        logger.info(f"[Cache] Loaded {self._count} cached translations")
+
+    def save(self) -> None:
+        """Commit the entries added or used since the last save."""
+        with self._lock:
+            if self._db is None or not self._db.in_transaction:
+                return
+            self._db.commit()
+        logger.debug(f"[Cache] Saved {self._count} cached translations")
+
+    def close(self) -> None:
+        """Commit pending entries and close the database."""
+        self.save()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """The open database, opened (and its size read) on first use."""
+        if self._db is not None:
+            return self._db
+
+        try:
+            db = self._open(self.path)
+        except sqlite3.DatabaseError as e:
+            # Keep the file for inspection and run without a memory
+            logger.warning(f"[Cache] Ignoring unreadable cache {self.path}: {e}")
+            db = self._open(":memory:")
+
+        self._count, last_used = db.execute(
+            "SELECT COUNT(*), COALESCE(MAX(used), 0) FROM translations"
+        ).fetchone()
+        self._clock = last_used
+        self._db = db
+        return db
+
+    @staticmethod
+    def _open(path: Path | str) -> sqlite3.Connection:
+        db = sqlite3.connect(path, check_same_thread=False)
+        try:
+            # The write-ahead log makes each commit an append instead of a rewrite,
+            # and NORMAL sync is durable enough for a cache
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+        except sqlite3.DatabaseError:
+            db.close()
+            raise
+        return db
@@ -1,30 +1,190 @@
 """API service for machine translation."""
 
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import json
 import logging
 import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
 
+import httpx
 from google import genai
+from google.genai import client as genai_client
+from google.genai import errors as genai_errors
 from google.genai import types
-from openai import OpenAI
+from openai import (
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+    RateLimitError,
+)
 
 from config import Config
 from models import Segment
+from rate_limiter import RateLimiter, RateLimitInfo, backoff_delay, retry_after
 from utils import PlaceholderManager
 
+try:
+    import orjson  # optional, from the "fast" extra
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# OpenAI Batch API: endpoint each line of the job calls, and how the job is polled
+BATCH_API_ENDPOINT = "/v1/responses"
+BATCH_JOB_PENDING_STATUSES = ("validating", "in_progress", "finalizing")
+BATCH_POLL_SECONDS = 30.0
+
+# Longest wait before a throttled retry, as a multiple of rate_limit_wait
+RATE_LIMIT_BACKOFF_CAP = 4
+
+# Rough size of a token in characters, for budgeting requests against a token quota
+CHARS_PER_TOKEN = 4
+
+# Appended to the system prompt when several batches share one request
+MEGABATCH_PROMPT_SUFFIX = """
+
+MULTIPLE REQUESTS
+- The INPUT holds several independent requests: {"requests": [{"id": 0, "segments": [...]}, ...]}.
+- Translate every request's segments following the rules above.
+- Answer with one entry per request instead of a single "translations" list:
+{
+  "translations_per_request": [
+    {"id": 0, "translations": [{"key": "KEY_FROM_INPUT", "text": "Translated text here"}]},
+    {"id": 1, "translations": [{"key": "ANOTHER_KEY", "text": "Another translation"}]}
+  ]
+}"""
+
+# Structured-output schemas the answers are constrained to, so the model cannot
+# return malformed JSON; the parsers below still check the shape
+_TRANSLATION_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {"key": {"type": "string"}, "text": {"type": "string"}},
+    "required": ["key", "text"],
+    "additionalProperties": False,
+}
+TRANSLATIONS_SCHEMA = {
+    "type": "object",
+    "properties": {"translations": {"type": "array", "items": _TRANSLATION_ITEM_SCHEMA}},
+    "required": ["translations"],
+    "additionalProperties": False,
+}
+MEGABATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "translations_per_request": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "translations": {"type": "array", "items": _TRANSLATION_ITEM_SCHEMA},
+                },
+                "required": ["id", "translations"],
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["translations_per_request"],
+    "additionalProperties": False,
+}
+
+# Pooled keep-alive connections, reused across batches and concurrent requests
+# instead of a new TCP/TLS handshake per call
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+
+@functools.cache
+def _http_client_args() -> dict:
+    """httpx client options for the SDK clients; HTTP/2 when the h2 package is installed."""
+    return {"limits": HTTP_LIMITS, "http2": importlib.util.find_spec("h2") is not None}
+
+
+def _dumps(payload) -> str:
+    """Serialize a request payload as compact JSON, keeping non-ASCII text as is."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _loads(raw_text: str):
+    """Parse a JSON response body; decode errors are json.JSONDecodeError either way."""
+    if orjson is not None:
+        return orjson.loads(raw_text)
+    return json.loads(raw_text)
+
 
 class TranslationService:
     """Handles API calls to OpenAI or Gemini for translation."""
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        rate_limiter: RateLimiter | None = None,
+        protect: Callable[[str], tuple[str, dict[str, str]]] = PlaceholderManager.protect,
+        async_client: genai_client.AsyncClient | AsyncOpenAI | None = None,
+    ):
         self.config = config
+        # May be a memoized PlaceholderManager.protect shared with the caller
+        self._protect = protect
+        # Fed with the quota headers of each response so request pacing can adapt
+        self.rate_limiter = rate_limiter
+        # Clients the service creates itself are closed by close()/aclose(); an
+        # async client passed in (see create_async_client) is left to its caller
+        self._owns_async_client = async_client is None
+        self._async_client = async_client
+        # Sync OpenAI client, only needed by the Batch API
+        self._client: OpenAI | None = None
+        # The prompt only depends on the configuration, so it is built once per service
+        self._system_prompt = self.build_system_prompt()
+        self._system_prompt_prefix = self._system_prompt + "\n\n"
+        self._megabatch_prompt = self._system_prompt + MEGABATCH_PROMPT_SUFFIX
+        self._megabatch_prompt_prefix = self._megabatch_prompt + "\n\n"
+        # Identifies the model and prompt translations come from, so the
+        # translation memory never serves output of a different setup
+        model = config.api.gemini_model if config.api.use_gemini else config.api.openai_model
+        self.prompt_fingerprint = hashlib.blake2b(
+            f"{model}|{self._system_prompt}".encode(), digest_size=8
+        ).hexdigest()
+
+        if config.api.use_gemini:
+            # Identical for every request, so they are built once per service
+            self._generate_config = self._gemini_config(TRANSLATIONS_SCHEMA)
+            self._megabatch_generate_config = self._gemini_config(MEGABATCH_SCHEMA)
+
+    @staticmethod
+    def create_async_client(config: Config) -> genai_client.AsyncClient | AsyncOpenAI:
+        """Build the configured provider's async client on pooled keep-alive connections.
 
+        The pool belongs to the event loop the client is first used in, so the
+        client should be created, used and closed (see aclose_client) on one loop.
+        """
         if config.api.use_gemini:
-            self.client = genai.Client(api_key=config.api.gemini_api_key)
+            return genai.Client(
+                api_key=config.api.gemini_api_key,
+                http_options=types.HttpOptions(async_client_args=_http_client_args()),
+            ).aio
+        return AsyncOpenAI(
+            api_key=config.api.openai_api_key,
+            http_client=DefaultAsyncHttpxClient(timeout=HTTP_TIMEOUT, **_http_client_args()),
+        )
+
+    @staticmethod
+    async def aclose_client(client: genai_client.AsyncClient | AsyncOpenAI) -> None:
+        """Close the pooled connections of a client from create_async_client()."""
+        if isinstance(client, AsyncOpenAI):
+            await client.close()
         else:
-            self.client = OpenAI(api_key=config.api.openai_api_key)
+            await client.aclose()
 
     def build_system_prompt(self) -> str:
         """Build the system prompt for the AI model.
@@ -87,157 +247,422 @@ RESPONSE FORMAT
 
 - Return exactly as many translations as segments provided in INPUT."""
 
+    def _segments_payload(self, batch: list[Segment]) -> list[dict]:
+        """Segments of a batch as sent to the model, placeholders protected.
+
+        Protection stays serial: batches hold at most 100 segments, tokenless
+        sources return from protect() after two substring checks, and the engine
+        passes a memoized protect whose scans it has already done for the cache
+        keys, so a worker pool would cost more to start than it could save.
+        """
+        protect = self._protect
+        return [
+            {
+                "key": seg.key,
+                "sheet": seg.sheet,
+                "source": protect(seg.source_text)[0],
+                "comment": seg.comment,
+            }
+            for seg in batch
+        ]
+
+    def estimate_tokens(self, batches: list[list[Segment]]) -> int:
+        """Rough token count of one request translating ``batches``, answer included.
+
+        Counts the system prompt once, and each segment's source and comment
+        twice: once in the request and once, translated, in the answer.
+        """
+        segment_tokens = self.segment_tokens
+        return len(self._system_prompt) // CHARS_PER_TOKEN + sum(
+            segment_tokens(seg) for batch in batches for seg in batch
+        )
+
+    @staticmethod
+    def segment_tokens(seg: Segment) -> int:
+        """Rough tokens one segment adds to a request and its answer."""
+        return 2 * (len(seg.key) + len(seg.source_text) + len(seg.comment)) // CHARS_PER_TOKEN
+
     def build_user_content(self, batch: list[Segment]) -> str:
         """Build the user message payload for API."""
-        payload = {"segments": []}
+        return _dumps({"segments": self._segments_payload(batch)})
 
-        for seg in batch:
-            protected, _ = PlaceholderManager.protect(seg.source_text)
-            payload["segments"].append(
-                {
-                    "key": seg.key,
-                    "sheet": seg.sheet,
-                    "source": protected,
-                    "comment": seg.comment,
-                }
-            )
-
-        return json.dumps(payload, ensure_ascii=False)
+    def build_megabatch_content(self, batches: list[list[Segment]]) -> str:
+        """Build the user message payload for several batches sent as one request."""
+        requests = [
+            {"id": request_id, "segments": self._segments_payload(batch)}
+            for request_id, batch in enumerate(batches)
+        ]
+        return _dumps({"requests": requests})
 
-    def translate_batch(self, batch: list[Segment]) -> dict[str, str]:
+    async def translate_batch_async(self, batch: list[Segment]) -> dict[str, str]:
         """
         Translate a batch of segments.
 
         Returns:
             Dict mapping key -> translated_text
         """
-        if self.config.api.use_gemini:
-            return self._translate_with_gemini(batch)
-        else:
-            return self._translate_with_openai(batch)
+        return await self._translate_async(
+            self.build_user_content(batch), len(batch), self._parse_result
+        )
 
-    def _translate_with_gemini(self, batch: list[Segment]) -> dict[str, str]:
-        """Translate using Google Gemini API."""
-        system_prompt = self.build_system_prompt()
-        user_content = self.build_user_content(batch)
-        full_prompt = system_prompt + "\n\n" + user_content
+    async def translate_megabatch_async(self, batches: list[list[Segment]]) -> list[dict[str, str]]:
+        """
+        Translate several batches in a single API request.
 
-        gen_config = types.GenerateContentConfig(
-            temperature=0.0,
-            candidate_count=1,
-            response_mime_type="application/json",
+        Each batch stays a separate sub-request in the payload, so the
+        per-batch size limit still applies while the request count drops.
+
+        Returns:
+            One dict mapping key -> translated_text per batch, in batch order
+        """
+        if len(batches) == 1:
+            return [await self.translate_batch_async(batches[0])]
+
+        def parse(raw_text: str) -> list[dict[str, str]]:
+            return self._parse_megabatch_response(raw_text, len(batches))
+
+        return await self._translate_async(
+            self.build_megabatch_content(batches),
+            sum(len(batch) for batch in batches),
+            parse,
+            megabatch=True,
         )
 
-        last_exception = None
+    def submit_batch_job(self, batches: list[list[Segment]]) -> str:
+        """Submit batches as one OpenAI Batch API job and return its id.
+
+        Each batch becomes one /v1/responses request of the uploaded JSONL file,
+        identified by its position in ``batches``.
+        """
+        lines = [
+            _dumps(
+                {
+                    "custom_id": f"batch-{i}",
+                    "method": "POST",
+                    "url": BATCH_API_ENDPOINT,
+                    "body": self._request(self.build_user_content(batch)),
+                }
+            )
+            for i, batch in enumerate(batches)
+        ]
+        input_file = self.client.files.create(
+            file=("translations.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        job = self.client.batches.create(
+            input_file_id=input_file.id, endpoint=BATCH_API_ENDPOINT, completion_window="24h"
+        )
+        logger.info(f"[OpenAI] Submitted batch job {job.id} ({len(batches)} requests)")
+        return job.id
 
-        for attempt in range(1, self.config.api.max_retries_gemini + 1):
+    def poll_batch(self, batch_id: str, n_batches: int) -> list[dict[str, str]] | None:
+        """Results of a submitted batch job, or None while it is still running.
+
+        Returns:
+            One dict mapping key -> translated_text per submitted batch, in order;
+            requests that failed inside the job yield an empty dict
+        """
+        job = self.client.batches.retrieve(batch_id)
+        if job.status in BATCH_JOB_PENDING_STATUSES:
+            return None
+        if job.status != "completed" or not job.output_file_id:
+            raise RuntimeError(f"Batch job {batch_id} ended with status '{job.status}'")
+
+        results: list[dict[str, str]] = [{} for _ in range(n_batches)]
+        for line in self.client.files.content(job.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = _loads(line)
+            index = int(record["custom_id"].removeprefix("batch-"))
+            response = record.get("response") or {}
+
+            if response.get("status_code") != 200:
+                logger.warning(f"[OpenAI] Batch request {index} failed: {record.get('error')}")
+                continue
             try:
-                logger.debug(
-                    f"[Gemini] Calling {self.config.api.gemini_model} for batch of "
-                    f"{len(batch)} segments (attempt {attempt}/{self.config.api.max_retries_gemini})"
-                )
+                output_text = response["body"]["output"][0]["content"][0]["text"]
+                results[index] = self._parse_json_response(output_text)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                logger.warning(f"[OpenAI] Unreadable result for batch request {index}: {e}")
+
+        return results
+
+    def translate_with_batch_api(self, batches: list[list[Segment]]) -> list[dict[str, str]]:
+        """Translate batches through the Batch API, waiting for the job to finish."""
+        batch_id = self.submit_batch_job(batches)
+
+        while (results := self.poll_batch(batch_id, len(batches))) is None:
+            logger.debug(f"[OpenAI] Batch job {batch_id} still running")
+            time.sleep(BATCH_POLL_SECONDS)
+
+        logger.info(f"[OpenAI] Batch job {batch_id} completed")
+        return results
+
+    @property
+    def async_client(self) -> genai_client.AsyncClient | AsyncOpenAI:
+        """Async API client every translation request goes through, created on first use."""
+        if self._async_client is None:
+            self._async_client = self.create_async_client(self.config)
+        return self._async_client
+
+    @property
+    def client(self) -> OpenAI:
+        """Sync OpenAI client for the Batch API's uploads and polling, created on first use."""
+        if self._client is None:
+            self._client = OpenAI(
+                api_key=self.config.api.openai_api_key,
+                http_client=DefaultHttpxClient(timeout=HTTP_TIMEOUT, **_http_client_args()),
+            )
+        return self._client
 
-                response = self.client.models.generate_content(
-                    model=self.config.api.gemini_model,
-                    contents=full_prompt,
-                    config=gen_config,
-                )
+    def close(self) -> None:
+        """Close the pooled connections of the Batch API client, if one was created."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the async client, if the service created it."""
+        if self._async_client is None or not self._owns_async_client:
+            return
+        await self.aclose_client(self._async_client)
+        self._async_client = None
 
-                raw_text = response.text
-                result = self._parse_json_response(raw_text)
+    @property
+    def _provider(self) -> str:
+        return "Gemini" if self.config.api.use_gemini else "OpenAI"
 
-                if result:
-                    logger.debug(f"[Gemini] Successfully translated {len(result)} segments")
+    @staticmethod
+    def _gemini_config(schema: dict) -> types.GenerateContentConfig:
+        """Deterministic generation config whose JSON answer follows ``schema``."""
+        return types.GenerateContentConfig(
+            temperature=0.0,
+            candidate_count=1,
+            response_mime_type="application/json",
+            response_json_schema=schema,
+        )
 
-                return result
+    def _request(self, user_content: str, megabatch: bool = False) -> dict:
+        """Build the provider's request arguments for one API call."""
+        if self.config.api.use_gemini:
+            if megabatch:
+                prefix, config = self._megabatch_prompt_prefix, self._megabatch_generate_config
+            else:
+                prefix, config = self._system_prompt_prefix, self._generate_config
+            return {
+                "model": self.config.api.gemini_model,
+                "contents": prefix + user_content,
+                "config": config,
+            }
+
+        return {
+            "model": self.config.api.openai_model,
+            "input": [
+                {
+                    "role": "system",
+                    "content": self._megabatch_prompt if megabatch else self._system_prompt,
+                },
+                {"role": "user", "content": user_content},
+            ],
+            "text": {
+                "format": {
+                    "type": "json_schema",
+                    "name": "translations_per_request" if megabatch else "translations",
+                    "schema": MEGABATCH_SCHEMA if megabatch else TRANSLATIONS_SCHEMA,
+                    "strict": True,
+                }
+            },
+        }
+
+    def _read_gemini_response(self, response) -> str:
+        """Record the quota headers of a Gemini response and return its text."""
+        http_response = getattr(response, "sdk_http_response", None)
+        self._observe_rate_limit(getattr(http_response, "headers", None))
+        return response.text
+
+    def _read_openai_response(self, raw_response) -> str:
+        """Record the quota headers of a raw OpenAI response and return its text."""
+        self._observe_rate_limit(raw_response.headers)
+        response = raw_response.parse()
+        return response.output[0].content[0].text
+
+    async def _translate_async(
+        self,
+        user_content: str,
+        n_segments: int,
+        parse: Callable[[str], T],
+        megabatch: bool = False,
+    ) -> T:
+        """Send one request to the configured provider's async client, with retries."""
+        request = self._request(user_content, megabatch)
 
-            except json.JSONDecodeError as e:
-                logger.error(f"[Gemini] JSON parse error: {e}")
-                last_exception = e
+        if self.config.api.use_gemini:
 
-            except Exception as e:
-                msg = str(e)
+            async def call() -> str:
+                response = await self.async_client.models.generate_content(**request)
+                return self._read_gemini_response(response)
 
-                # Handle rate limiting
-                if "429" in msg or "RESOURCE_EXHAUSTED" in msg or "rate limit" in msg.lower():
-                    wait_time = self.config.api.rate_limit_wait * attempt
-                    logger.warning(f"[Gemini] Rate limited, waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                    continue
+        else:
+            headers = self._idempotency_headers()
 
-                logger.error(f"[Gemini] API error (attempt {attempt}): {e}")
-                last_exception = e
+            async def call() -> str:
+                raw_response = await self.async_client.responses.with_raw_response.create(
+                    **request, extra_headers=headers
+                )
+                return self._read_openai_response(raw_response)
 
-                if attempt < self.config.api.max_retries_gemini:
-                    wait_time = 5.0 * attempt
-                    logger.debug(f"[Gemini] Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+        return await self._call_with_retries_async(request["model"], n_segments, call, parse)
 
-        if last_exception:
-            raise last_exception
-        raise RuntimeError("Failed to translate batch with Gemini")
+    @staticmethod
+    def _idempotency_headers() -> dict[str, str]:
+        """Idempotency-Key header shared by every attempt of one logical request.
 
-    def _translate_with_openai(self, batch: list[Segment]) -> dict[str, str]:
-        """Translate using OpenAI API."""
-        system_prompt = self.build_system_prompt()
-        user_content = self.build_user_content(batch)
+        Retries of a request the server already completed then return that
+        completion instead of billing a new one. The key is random rather than
+        derived from the prompt, so translating the same batch again later (as the
+        gap-filling phase does) still gets a fresh completion.
+        """
+        return {"Idempotency-Key": f"tm-loc-{uuid.uuid4().hex}"}
 
+    def _max_retries(self) -> int:
+        if self.config.api.use_gemini:
+            return self.config.api.max_retries_gemini
+        return self.config.api.max_retries_openai
+
+    async def _call_with_retries_async(
+        self,
+        model: str,
+        n_segments: int,
+        call: Callable[[], Awaitable[str]],
+        parse: Callable[[str], T],
+    ) -> T:
+        """Await ``call`` until it returns a parseable response or retries run out."""
+        provider = self._provider
+        max_retries = self._max_retries()
         last_exception = None
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-        for attempt in range(1, self.config.api.max_retries_openai + 1):
+        for attempt in range(1, max_retries + 1):
             try:
-                logger.debug(
-                    f"[OpenAI] Calling {self.config.api.openai_model} for batch of "
-                    f"{len(batch)} segments (attempt {attempt}/{self.config.api.max_retries_openai})"
-                )
+                if debug:
+                    logger.debug(
+                        f"[{provider}] Calling {model} for batch of "
+                        f"{n_segments} segments (attempt {attempt}/{max_retries})"
+                    )
+                return parse(await call())
 
-                response = self.client.responses.create(
-                    model=self.config.api.openai_model,
-                    input=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_content},
-                    ],
-                )
+            except Exception as e:
+                wait_time, failed = self._retry_delay(provider, e, attempt, max_retries)
+                if failed:
+                    last_exception = e
+                if wait_time:
+                    await asyncio.sleep(wait_time)
 
-                raw_text = response.output[0].content[0].text
-                result = self._parse_json_response(raw_text)
+        if last_exception:
+            raise last_exception
+        raise RuntimeError(f"Failed to translate batch with {provider}")
 
-                if result:
-                    logger.debug(f"[OpenAI] Successfully translated {len(result)} segments")
+    def _parse_result(self, raw_text: str) -> dict[str, str]:
+        """Parse a response body into key -> translation."""
+        result = self._parse_json_response(raw_text)
 
-                return result
+        if result:
+            logger.debug(f"[{self._provider}] Successfully translated {len(result)} segments")
 
-            except json.JSONDecodeError as e:
-                logger.error(f"[OpenAI] JSON parse error: {e}")
-                last_exception = e
+        return result
 
-            except Exception as e:
-                msg = str(e)
+    @staticmethod
+    def _is_rate_limited(error: Exception) -> bool:
+        """Whether an API error reports rate limiting (HTTP 429)."""
+        if isinstance(error, RateLimitError):
+            return True
+        return isinstance(error, genai_errors.ClientError) and error.code == 429
 
-                # Handle rate limiting
-                if "rate_limit_exceeded" in msg or "Rate limit reached" in msg:
-                    wait_time = self.config.api.rate_limit_wait * attempt
-                    logger.warning(f"[OpenAI] Rate limited, waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                    continue
+    def _retry_delay(
+        self, provider: str, error: Exception, attempt: int, max_retries: int
+    ) -> tuple[float, bool]:
+        """Handle a failed attempt.
 
-                logger.error(f"[OpenAI] API error (attempt {attempt}): {e}")
-                last_exception = e
+        Returns:
+            Tuple of (seconds to wait before the next attempt, whether the error
+            counts as the batch's failure). Rate limiting only waits.
+        """
+        if isinstance(error, json.JSONDecodeError):
+            logger.error(f"[{provider}] JSON parse error: {error}")
+            return 0.0, True
+
+        # Handle rate limiting
+        if self._is_rate_limited(error):
+            if self.rate_limiter is not None:
+                self.rate_limiter.throttled()
+            # Quotas refill over tens of seconds, so throttled retries back off from
+            # rate_limit_wait rather than the one-second base used for other errors
+            rate_limit_wait = self.config.api.rate_limit_wait
+            wait_time = backoff_delay(
+                attempt,
+                base=rate_limit_wait,
+                cap=RATE_LIMIT_BACKOFF_CAP * rate_limit_wait,
+                retry_after=retry_after(error),
+            )
+            logger.warning(f"[{provider}] Rate limited, waiting {wait_time:.1f}s before retry...")
+            return wait_time, False
 
-                if attempt < self.config.api.max_retries_openai:
-                    wait_time = 5.0 * attempt
-                    logger.debug(f"[OpenAI] Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+        logger.error(f"[{provider}] API error (attempt {attempt}): {error}")
 
-        if last_exception:
-            raise last_exception
-        raise RuntimeError("Failed to translate batch with OpenAI")
+        if attempt < max_retries:
+            wait_time = backoff_delay(attempt, retry_after=retry_after(error))
+            logger.debug(f"[{provider}] Retrying in {wait_time:.1f}s...")
+            return wait_time, True
+        return 0.0, True
+
+    def _observe_rate_limit(self, headers) -> None:
+        """Pass the response's rate-limit headers on to the shared limiter."""
+        if self.rate_limiter is None:
+            return
+
+        info = RateLimitInfo.from_headers(headers)
+        if logger.isEnabledFor(logging.DEBUG):
+            if info.remaining is not None:
+                logger.debug(
+                    f"[RateLimit] {info.remaining} requests left, resets in {info.reset_seconds}s"
+                )
+            if info.remaining_tokens is not None:
+                logger.debug(
+                    f"[RateLimit] {info.remaining_tokens} tokens left, "
+                    f"resets in {info.tokens_reset_seconds}s"
+                )
+        self.rate_limiter.observe(info)
+
+    def _parse_megabatch_response(self, raw_text: str, n_batches: int) -> list[dict[str, str]]:
+        """Parse a multi-request response into one key -> translation dict per batch."""
+        data = _loads(raw_text)
+
+        per_request = data.get("translations_per_request") if isinstance(data, dict) else None
+        if not isinstance(per_request, list):
+            raise ValueError("Missing 'translations_per_request' list in API response")
+
+        results: list[dict[str, str]] = [{} for _ in range(n_batches)]
+        for position, item in enumerate(per_request):
+            if not isinstance(item, dict):
+                continue
+            request_id = item.get("id", position)
+            if isinstance(request_id, int) and 0 <= request_id < n_batches:
+                results[request_id] = self._parse_translations(item)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"[{self._provider}] Successfully translated "
+                f"{sum(len(r) for r in results)} segments in {n_batches} requests"
+            )
+        return results
 
     @staticmethod
     def _parse_json_response(raw_text: str) -> dict[str, str]:
         """Parse JSON response from API."""
-        data = json.loads(raw_text)
+        return TranslationService._parse_translations(_loads(raw_text))
 
+    @staticmethod
+    def _parse_translations(data: dict) -> dict[str, str]:
+        """Read the 'translations' list of a response object into key -> text."""
         if "translations" not in data:
             raise ValueError("Missing 'translations' key in API response")
 
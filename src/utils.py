@@ -1,70 +1,120 @@
 """Utility functions for placeholder handling and text processing."""
 
 import re
+import sys
+
+# Both kinds in one pass: group 1 is a variable, group 2 a tag
+PLACEHOLDER_PATTERN_ANY = re.compile(r"(\{\[[^}]+\]\})|(<[^>]+>)")
+# Tokens are only ever numbered with ASCII digits
+TOKEN_PATTERN = re.compile(r"__(?:VAR|TAG)\d+__", re.ASCII)
+
+# Bound methods of the patterns, called by the per-segment helpers below
+_placeholder_sub = PLACEHOLDER_PATTERN_ANY.sub
+_placeholder_finditer = PLACEHOLDER_PATTERN_ANY.finditer
+_token_sub = TOKEN_PATTERN.sub
+_token_findall = TOKEN_PATTERN.findall
+_token_finditer = TOKEN_PATTERN.finditer
+
+# Interned names for the first tokens of each kind, which cover almost every
+# segment, so they are not formatted again per match and compare by identity
+_PRENAMED_TOKENS = 32
+_VAR_TOKENS = tuple(sys.intern(f"__VAR{i}__") for i in range(_PRENAMED_TOKENS))
+_TAG_TOKENS = tuple(sys.intern(f"__TAG{i}__") for i in range(_PRENAMED_TOKENS))
+
+
+def _var_token(i: int) -> str:
+    return _VAR_TOKENS[i] if i < _PRENAMED_TOKENS else f"__VAR{i}__"
+
+
+def _tag_token(i: int) -> str:
+    return _TAG_TOKENS[i] if i < _PRENAMED_TOKENS else f"__TAG{i}__"
 
 
 class PlaceholderManager:
     """Manages protection and restoration of placeholder tokens in text."""
 
-    PLACEHOLDER_PATTERN_TAG = re.compile(r"<[^>]+>")
-    PLACEHOLDER_PATTERN_VAR = re.compile(r"{\[[^}]+\]}")
-    TOKEN_PATTERN = re.compile(r"__(?:VAR|TAG)\d+__")
+    PLACEHOLDER_PATTERN_ANY = PLACEHOLDER_PATTERN_ANY
+    TOKEN_PATTERN = TOKEN_PATTERN
 
     @staticmethod
     def protect(text: str) -> tuple[str, dict[str, str]]:
         """
         Replace placeholders with safe tokens.
 
+        Variables and tags are numbered separately, in order of appearance.
+
         Returns:
             Tuple of (protected_text, token_to_original_map)
         """
+        # Most strings have no placeholders: two substring scans are much cheaper than a regex pass
+        if "{[" not in text and "<" not in text:
+            return text, {}
+
         placeholder_map: dict[str, str] = {}
+        var_count = 0
+        tag_count = 0
+
+        def replace_with_token(m: re.Match) -> str:
+            nonlocal var_count, tag_count
+            if m.group(1):
+                token = _var_token(var_count)
+                var_count += 1
+            else:
+                token = _tag_token(tag_count)
+                tag_count += 1
+            placeholder_map[token] = m.group(0)
+            return token
 
-        def replace_with_tokens(pattern, prefix, input_text):
-            matches = list(pattern.finditer(input_text))
-            if not matches:
-                return input_text
-
-            out = []
-            last = 0
-            for i, m in enumerate(matches):
-                out.append(input_text[last : m.start()])
-                original = m.group(0)
-                token = f"__{prefix}{i}__"
-                placeholder_map[token] = original
-                out.append(token)
-                last = m.end()
-            out.append(input_text[last:])
-            return "".join(out)
-
-        protected = replace_with_tokens(PlaceholderManager.PLACEHOLDER_PATTERN_VAR, "VAR", text)
-        protected = replace_with_tokens(
-            PlaceholderManager.PLACEHOLDER_PATTERN_TAG, "TAG", protected
-        )
+        protected = _placeholder_sub(replace_with_token, text)
         return protected, placeholder_map
 
+    @staticmethod
+    def source_tokens(text: str) -> list[str]:
+        """Tokens protect() would produce for text, in order, without building the text or map."""
+        if "{[" not in text and "<" not in text:
+            return []
+
+        tokens: list[str] = []
+        append = tokens.append
+        var_count = 0
+        tag_count = 0
+        for m in _placeholder_finditer(text):
+            if m.group(1):
+                append(_var_token(var_count))
+                var_count += 1
+            else:
+                append(_tag_token(tag_count))
+                tag_count += 1
+        return tokens
+
     @staticmethod
     def restore(text: str, placeholder_map: dict[str, str]) -> str:
         """Restore original placeholders from tokens."""
-        restored = text
-        # Sort tokens to ensure deterministic replacement order
-        for token in sorted(placeholder_map.keys()):
-            original = placeholder_map[token]
-            restored = restored.replace(token, original)
-        return restored
+        if not placeholder_map:
+            return text
+        # One left-to-right pass; tokens missing from the map are left as they are
+        lookup = placeholder_map.get
+        return _token_sub(lambda m: lookup(m.group(0), m.group(0)), text)
 
     @staticmethod
     def extract_tokens(text: str) -> list:
         """Extract all placeholder tokens from text."""
-        return PlaceholderManager.TOKEN_PATTERN.findall(text)
+        return _token_findall(text)
 
     @staticmethod
     def tokens_in_order(text: str, tokens: list) -> bool:
-        """Check if tokens appear in the same order in text."""
-        pos = -1
-        for token in tokens:
-            new_pos = text.find(token, pos + 1)
-            if new_pos == -1:
-                return False
-            pos = new_pos
-        return True
+        """Check if tokens appear in the same order in text.
+
+        ``tokens`` must be a subsequence of the tokens found in one scan of text.
+        """
+        n_wanted = len(tokens)
+        if not n_wanted:
+            return True
+
+        i = 0
+        for m in _token_finditer(text):
+            if m.group(0) == tokens[i]:
+                i += 1
+                if i == n_wanted:
+                    return True
+        return False
@@ -1,50 +1,102 @@
 """Validation service for translation quality checks."""
 
+import functools
 import logging
+from collections.abc import Iterable, Mapping
 
 from models import Segment, ValidationReport
 from utils import PlaceholderManager
 
 logger = logging.getLogger(__name__)
 
+# Distinct (source tokens, translation) pairs whose token checks are remembered
+VALIDATION_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _check_tokens(
+    source_tokens: tuple[str, ...], translated_text: str
+) -> tuple[tuple[str, ...], tuple[str, ...], bool]:
+    """Target tokens, missing source tokens and out-of-order flag for one translation.
+
+    Depends only on its arguments, so repeated sources and cached translations
+    fanned out to many rows are checked once.
+    """
+    target_tokens = tuple(PlaceholderManager.extract_tokens(translated_text))
+
+    # Both checks work on the tokens already found in the translation's single scan
+    found = set(target_tokens)
+    missing = tuple(tok for tok in source_tokens if tok not in found)
+    if missing:
+        return target_tokens, missing, False
+
+    # Check token order: the source tokens must be a subsequence of the
+    # translation's, and `in` on an iterator consumes it up to each match
+    remaining = iter(target_tokens)
+    return target_tokens, (), not all(tok in remaining for tok in source_tokens)
+
 
 class ValidationService:
     """Validates translated text for placeholder preservation and correctness."""
 
     @staticmethod
     def validate_translation(
-        segment: Segment, translated_text: str, placeholder_map: dict
+        segment: Segment,
+        translated_text: str,
+        source_token_map: Mapping[str, str] | None = None,
     ) -> ValidationReport:
         """
         Validate that a translation preserves placeholders correctly.
 
+        Args:
+            source_token_map: The map PlaceholderManager.protect() returned for
+                this segment's source, if the caller already has it. Its keys are
+                the source tokens in order, so the source is not scanned again.
+
         Returns:
             ValidationReport with status and any issues found
         """
-        # Extract tokens from source
-        protected_source, _ = PlaceholderManager.protect(segment.source_text)
-        source_tokens = PlaceholderManager.extract_tokens(protected_source)
+        source_text = segment.source_text
 
-        # Extract tokens from translation
-        target_tokens = PlaceholderManager.extract_tokens(translated_text)
+        # A source without placeholders has no tokens to lose or reorder; most
+        # of their translations have no stray tokens to report either
+        if "{[" not in source_text and "<" not in source_text:
+            if "__VAR" in translated_text or "__TAG" in translated_text:
+                target_tokens = tuple(PlaceholderManager.extract_tokens(translated_text))
+            else:
+                target_tokens = ()
+            return ValidationReport(key=segment.key, target_tokens=target_tokens)
 
-        report = ValidationReport(
+        # Tokens the source was protected with
+        if source_token_map is not None:
+            source_tokens = tuple(source_token_map)
+        else:
+            source_tokens = tuple(PlaceholderManager.source_tokens(source_text))
+
+        target_tokens, missing, out_of_order = _check_tokens(source_tokens, translated_text)
+        if missing:
+            logger.warning(f"[Validation] Missing tokens for key={segment.key}: {list(missing)}")
+        elif out_of_order:
+            logger.warning(f"[Validation] Tokens out of order for key={segment.key}")
+
+        return ValidationReport(
             key=segment.key,
             source_tokens=source_tokens,
             target_tokens=target_tokens,
+            missing_tokens=missing,
+            out_of_order=out_of_order,
         )
 
-        # Check for missing tokens
-        missing = [tok for tok in source_tokens if tok not in translated_text]
-        if missing:
-            report.missing_tokens = missing
-            logger.warning(f"[Validation] Missing tokens for key={segment.key}: {missing}")
-            return report
+    @staticmethod
+    def validate_batch(items: Iterable[tuple[Segment, str]]) -> list[ValidationReport]:
+        """
+        Validate many translations at once.
 
-        # Check token order
-        if source_tokens and not PlaceholderManager.tokens_in_order(translated_text, source_tokens):
-            report.out_of_order = True
-            logger.warning(f"[Validation] Tokens out of order for key={segment.key}")
-            return report
+        Args:
+            items: (segment, translated_text) pairs
 
-        return report
+        Returns:
+            One ValidationReport per item, in order
+        """
+        validate = ValidationService.validate_translation
+        return [validate(seg, text) for seg, text in items]
@@ -10,8 +10,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from models import Segment
 
+# Segments are read-only inputs to the code under test, so one instance of each
+# is shared by the whole session
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def sample_segment():
     """Basic segment without placeholders."""
     return Segment(
@@ -22,7 +25,7 @@ def sample_segment():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def segment_with_var():
     """Segment with variable placeholder."""
     return Segment(
@@ -33,7 +36,7 @@ def segment_with_var():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def segment_with_tags():
     """Segment with HTML-like tags."""
     return Segment(
@@ -44,7 +47,7 @@ def segment_with_tags():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def segment_with_mixed():
     """Segment with both variables and tags."""
     return Segment(
@@ -55,7 +58,7 @@ def segment_with_mixed():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def segment_donottranslate():
     """Segment marked as do not translate."""
     return Segment(
@@ -67,7 +70,7 @@ def segment_donottranslate():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def segment_already_translated():
     """Segment that already has a translation."""
     return Segment(
@@ -0,0 +1,53 @@
+"""Tests for LocalizationEngine."""
+
+import asyncio
+
+import pytest
+
+from config import Config
+from localization_engine import LocalizationEngine
+from models import Segment
+from tm_cache import TranslationMemoryCache
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Engine whose logs and translation memory live in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = Config()
+    config.translation.batch_cooldown_seconds = 0.0
+    engine = LocalizationEngine(
+        config,
+        tmp_path / "mt_keys_test.csv",
+        translation_cache=TranslationMemoryCache(tmp_path / "tm.sqlite"),
+    )
+    yield engine
+    engine._log_fh.close()
+    engine.translation_cache.close()
+    engine.translation_service.close()
+
+
+class TestLocalizationEngine:
+    """Tests for batch processing in the engine."""
+
+    def test_repeats_restore_their_own_placeholders(self, engine, monkeypatch):
+        """Sources differing only in placeholder content should each keep their own."""
+        segments = [
+            Segment(sheet="UI", row_idx=2, key="K1", source_text="Hello <b>"),
+            Segment(sheet="UI", row_idx=3, key="K2", source_text="Hello <i>"),
+        ]
+        sent = []
+
+        async def fake_megabatch(batches):
+            sent.extend(seg.key for batch in batches for seg in batch)
+            return [{seg.key: "Bonjour __TAG0__" for seg in batch} for batch in batches]
+
+        monkeypatch.setattr(engine.translation_service, "translate_megabatch_async", fake_megabatch)
+
+        unique, repeats = engine._dedupe(segments)
+        results = asyncio.run(engine._process_batches("UI", [unique], repeats))
+
+        assert sent == ["K1"]
+        assert results == [{2: "Bonjour <b>", 3: "Bonjour <i>"}]
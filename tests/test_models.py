@@ -1,5 +1,9 @@
 """Tests for data models."""
 
+import dataclasses
+
+import pytest
+
 from models import Segment, TranslationResult, ValidationReport
 
 
@@ -41,6 +45,13 @@ class TestSegment:
         """Segment with placeholders should need translation."""
         assert segment_with_var.needs_translation() is True
 
+    def test_segment_is_immutable(self, sample_segment):
+        """Segments shared across the pipeline should reject changes and be hashable."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            sample_segment.source_text = "changed"
+
+        assert {sample_segment} == {dataclasses.replace(sample_segment)}
+
 
 class TestTranslationResult:
     """Tests for the TranslationResult dataclass."""
@@ -88,8 +99,8 @@ class TestValidationReport:
         """Test valid report with no issues."""
         report = ValidationReport(
             key="test_key",
-            source_tokens=["__VAR0__"],
-            target_tokens=["__VAR0__"],
+            source_tokens=("__VAR0__",),
+            target_tokens=("__VAR0__",),
         )
         assert report.is_valid is True
 
@@ -97,9 +108,9 @@ class TestValidationReport:
         """Test invalid report with missing tokens."""
         report = ValidationReport(
             key="test_key",
-            source_tokens=["__VAR0__", "__VAR1__"],
-            target_tokens=["__VAR0__"],
-            missing_tokens=["__VAR1__"],
+            source_tokens=("__VAR0__", "__VAR1__"),
+            target_tokens=("__VAR0__",),
+            missing_tokens=("__VAR1__",),
         )
         assert report.is_valid is False
 
@@ -107,8 +118,8 @@ class TestValidationReport:
         """Test invalid report with tokens out of order."""
         report = ValidationReport(
             key="test_key",
-            source_tokens=["__VAR0__", "__VAR1__"],
-            target_tokens=["__VAR1__", "__VAR0__"],
+            source_tokens=("__VAR0__", "__VAR1__"),
+            target_tokens=("__VAR1__", "__VAR0__"),
             out_of_order=True,
         )
         assert report.is_valid is False
@@ -117,7 +128,7 @@ class TestValidationReport:
         """Test report with no tokens (plain text)."""
         report = ValidationReport(
             key="test_key",
-            source_tokens=[],
-            target_tokens=[],
+            source_tokens=(),
+            target_tokens=(),
         )
         assert report.is_valid is True
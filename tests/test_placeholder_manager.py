@@ -14,6 +14,14 @@ class TestPlaceholderProtection:
         assert protected == text
         assert token_map == {}
 
+    def test_protect_lone_bracket(self):
+        """A '<' that does not open a tag should be left alone."""
+        text = "Level < 5"
+        protected, token_map = PlaceholderManager.protect(text)
+
+        assert protected == text
+        assert token_map == {}
+
     def test_protect_single_variable(self):
         """Single variable placeholder should be tokenized."""
         text = "Hello, {[player]}!"
@@ -66,6 +74,15 @@ class TestPlaceholderProtection:
         assert "__TAG0__" in protected
         assert "__TAG1__" in protected
 
+    def test_source_tokens_match_protect(self):
+        """source_tokens() should list the tokens protect() inserts, in order."""
+        text = "<player>{[name]}</player> scored {[points]} points!"
+        protected, _token_map = PlaceholderManager.protect(text)
+
+        assert PlaceholderManager.source_tokens(text) == PlaceholderManager.extract_tokens(
+            protected
+        )
+
 
 class TestPlaceholderRestoration:
     """Tests for placeholder restoration."""
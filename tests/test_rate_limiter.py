@@ -0,0 +1,214 @@
+"""Tests for RateLimiter."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, RateLimitInfo, backoff_delay, parse_duration, retry_after
+
+
+class FakeClock:
+    """Monotonic clock that only advances when sleep() is called."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self, seconds):
+        self.sleep(seconds)
+
+
+class TestRateLimiter:
+    """Tests for request pacing."""
+
+    def test_first_request_does_not_wait(self, monkeypatch):
+        """The first caller should start immediately."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, "time", clock)
+
+        RateLimiter(5.0).wait()
+
+        assert clock.sleeps == []
+
+    def test_requests_are_spaced_by_interval(self, monkeypatch):
+        """Consecutive callers should be spaced min_interval apart."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, "time", clock)
+        limiter = RateLimiter(5.0)
+
+        limiter.wait()
+        limiter.wait()
+        clock.now += 2.0
+        limiter.wait()
+
+        assert clock.sleeps == [5.0, 3.0]
+
+    def test_wait_async_shares_spacing(self, monkeypatch):
+        """Async callers should be paced on the same schedule as threads."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, "time", clock)
+        monkeypatch.setattr(rate_limiter, "asyncio", SimpleNamespace(sleep=clock.async_sleep))
+        limiter = RateLimiter(5.0)
+
+        limiter.wait()
+        asyncio.run(limiter.wait_async())
+
+        assert clock.sleeps == [5.0]
+
+    def test_zero_interval_never_waits_across_threads(self):
+        """With no interval, concurrent callers should all pass straight through."""
+        limiter = RateLimiter(0.0)
+        threads = [threading.Thread(target=limiter.wait) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=1.0)
+
+        assert not any(thread.is_alive() for thread in threads)
+
+    def test_observe_spreads_remaining_quota(self, monkeypatch):
+        """Reported quota should set the spacing to reset time / remaining requests."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, "time", clock)
+        limiter = RateLimiter(22.0)
+
+        limiter.observe(RateLimitInfo(remaining=30, reset_seconds=60.0))
+        limiter.wait()
+        limiter.wait()
+
+        assert clock.sleeps == [2.0]
+
+    def test_observe_exhausted_quota_waits_for_reset(self, monkeypatch):
+        """With no requests left, the next request should wait for the reset."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, "time", clock)
+        limiter = RateLimiter(0.0)
+
+        limiter.observe(RateLimitInfo(remaining=0, reset_seconds=7.5))
+        limiter.wait()
+
+        assert clock.sleeps == [7.5]
+
+    def test_observe_without_headers_uses_fallback(self):
+        """Missing quota information should fall back to min_interval."""
+        limiter = RateLimiter(22.0)
+        limiter.observe(RateLimitInfo(remaining=30, reset_seconds=60.0))
+
+        limiter.observe(RateLimitInfo.from_headers({}))
+
+        assert limiter.interval == 22.0
+
+    def test_token_budget_waits_for_reset(self, monkeypatch):
+        """A request that would overdraw the reported token quota should wait for its reset."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, "time", clock)
+        limiter = RateLimiter(0.0)
+
+        limiter.observe(RateLimitInfo(remaining_tokens=1000, tokens_reset_seconds=6.0))
+        limiter.wait(tokens=600)
+        limiter.wait(tokens=300)
+        limiter.wait(tokens=300)
+
+        assert clock.sleeps == [6.0]
+
+    def test_tokens_per_minute_caps_sliding_window(self, monkeypatch):
+        """Requests beyond the per-minute token budget should wait for older ones to age out."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limiter, "time", clock)
+        limiter = RateLimiter(0.0, tokens_per_minute=1000)
+
+        limiter.wait(tokens=600)
+        clock.now += 10.0
+        limiter.wait(tokens=300)
+        limiter.wait(tokens=300)
+
+        assert clock.sleeps == [50.0]
+
+    def test_throttled_widens_spacing_until_responses_recover(self, monkeypatch):
+        """Rate-limit errors should double the extra spacing; responses should shrink it."""
+        monkeypatch.setattr(rate_limiter, "time", FakeClock())
+        limiter = RateLimiter(0.0)
+
+        limiter.throttled()
+        limiter.throttled()
+        widened = limiter.throttle
+        limiter.observe(RateLimitInfo())
+
+        assert widened == 2 * rate_limiter.THROTTLE_STEP_SECONDS
+        assert limiter.throttle == widened - rate_limiter.THROTTLE_RECOVERY_SECONDS
+
+
+class TestRateLimitHeaders:
+    """Tests for parsing provider rate-limit headers."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("1s", 1.0), ("20ms", 0.02), ("6m0s", 360.0), ("1h2m3.5s", 3723.5), ("2.5", 2.5)],
+    )
+    def test_parse_duration(self, value, expected):
+        """Reset durations should be converted to seconds."""
+        assert parse_duration(value) == pytest.approx(expected)
+
+    def test_parse_duration_rejects_garbage(self):
+        """Unrecognized durations should yield None."""
+        assert parse_duration("soon") is None
+
+    def test_from_headers(self):
+        """Quota headers should be read case-insensitively."""
+        info = RateLimitInfo.from_headers(
+            {
+                "X-RateLimit-Remaining-Requests": "59",
+                "x-ratelimit-reset-requests": "1m0s",
+                "x-ratelimit-remaining-tokens": "149984",
+                "X-RateLimit-Reset-Tokens": "6ms",
+            }
+        )
+
+        assert info.remaining == 59
+        assert info.reset_seconds == 60.0
+        assert info.remaining_tokens == 149984
+        assert info.tokens_reset_seconds == pytest.approx(0.006)
+
+
+class TestBackoff:
+    """Tests for retry delays."""
+
+    def test_backoff_is_jittered_and_capped(self, monkeypatch):
+        """Delays should be drawn from [0, min(cap, base * 2**(attempt-1))]."""
+        monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+
+        delays = [backoff_delay(attempt, base=1.0, cap=10.0) for attempt in range(1, 6)]
+
+        assert delays == [1.0, 2.0, 4.0, 8.0, 10.0]
+
+    def test_retry_after_header_wins(self):
+        """A Retry-After header should override the computed backoff."""
+        error = Exception("429")
+        error.response = SimpleNamespace(headers={"retry-after": "7"})
+
+        assert backoff_delay(3, retry_after=retry_after(error)) == 7.0
+
+    def test_retry_after_from_gemini_details(self):
+        """Gemini's RetryInfo retryDelay should be read from the error details."""
+        error = Exception("429 RESOURCE_EXHAUSTED")
+        error.details = {
+            "error": {
+                "details": [
+                    {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "31s"}
+                ]
+            }
+        }
+
+        assert retry_after(error) == 31.0
+        assert retry_after(Exception("boom")) is None
@@ -0,0 +1,61 @@
+"""Tests for the settings INI parser."""
+
+import pytest
+
+from settings_manager import FastConfigParser
+
+SAMPLE_INI = """
+[Translation]
+target_language = Portuguese
+# ai_prompt_file = custom_prompt.txt
+Batch_Size = 50
+
+[API]
+; comment line
+rate_limit_wait = 25.0
+use_batch_api = Yes
+"""
+
+
+class TestFastConfigParser:
+    """Tests for FastConfigParser."""
+
+    def test_parse_sections_and_options(self):
+        """Options should be read per section with surrounding spaces stripped."""
+        parser = FastConfigParser()
+        parser.read_string(SAMPLE_INI)
+
+        assert parser.get("Translation", "target_language") == "Portuguese"
+        assert parser.getint("Translation", "batch_size") == 50
+        assert parser.getfloat("API", "rate_limit_wait") == 25.0
+
+    def test_getboolean(self):
+        """Boolean options should accept ConfigParser's spellings, case-insensitively."""
+        parser = FastConfigParser()
+        parser.read_string(SAMPLE_INI)
+
+        assert parser.getboolean("API", "use_batch_api") is True
+        with pytest.raises(ValueError, match="boolean"):
+            parser.getboolean("Translation", "target_language")
+
+    def test_comments_are_ignored(self):
+        """Commented-out options should not be visible."""
+        parser = FastConfigParser()
+        parser.read_string(SAMPLE_INI)
+
+        assert parser.has_option("Translation", "ai_prompt_file") is False
+
+    def test_missing_option_raises(self):
+        """Missing options should raise a ValueError."""
+        parser = FastConfigParser()
+        parser.read_string(SAMPLE_INI)
+
+        with pytest.raises(ValueError, match="excel_file"):
+            parser.get("Excel", "excel_file")
+
+    def test_invalid_line_raises(self):
+        """Lines that are neither sections nor options should be rejected."""
+        parser = FastConfigParser()
+
+        with pytest.raises(ValueError, match="line 2"):
+            parser.read_string("[Translation]\nnot an option\n")
@@ -0,0 +1,61 @@
+"""Tests for TranslationMemoryCache."""
+
+from tm_cache import TranslationMemoryCache
+
+
+class TestTranslationMemoryCache:
+    """Tests for the persistent translation memory."""
+
+    def test_key_depends_on_languages_and_sheet(self):
+        """The same source should get a different key per language pair and sheet."""
+        key = TranslationMemoryCache.make_key("English", "Portuguese", "UI", "Yes")
+
+        assert key == TranslationMemoryCache.make_key("English", "Portuguese", "UI", "Yes")
+        assert key != TranslationMemoryCache.make_key("English", "French", "UI", "Yes")
+        assert key != TranslationMemoryCache.make_key("English", "Portuguese", "MATCH", "Yes")
+
+    def test_key_depends_on_comment_and_prompt(self):
+        """A different comment, model or prompt should not reuse an earlier translation."""
+        key = TranslationMemoryCache.make_key("English", "Portuguese", "UI", "Yes", "btn", "p1")
+
+        assert key != TranslationMemoryCache.make_key(
+            "English", "Portuguese", "UI", "Yes", "", "p1"
+        )
+        assert key != TranslationMemoryCache.make_key(
+            "English", "Portuguese", "UI", "Yes", "btn", "p2"
+        )
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Beyond max_entries, the entry used longest ago should be dropped."""
+        cache = TranslationMemoryCache(tmp_path / "tm.sqlite", max_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+
+        cache.put("c", "C")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Saved entries should be available to the next run."""
+        path = tmp_path / "tm.sqlite"
+        cache = TranslationMemoryCache(path)
+        cache.put("a", "Olá __VAR0__")
+        cache.save()
+
+        reloaded = TranslationMemoryCache(path)
+        reloaded.load()
+
+        assert reloaded.get("a") == "Olá __VAR0__"
+
+    def test_unreadable_file_is_ignored(self, tmp_path):
+        """A corrupt cache file should start an empty cache instead of failing."""
+        path = tmp_path / "tm.sqlite"
+        path.write_text("not a database " * 16, encoding="utf-8")
+        cache = TranslationMemoryCache(path)
+
+        cache.load()
+
+        assert len(cache) == 0
@@ -0,0 +1,43 @@
+"""Tests for TranslationService."""
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+import rate_limiter
+from config import Config
+from translation_service import TranslationService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """OpenAI service with a 25s rate-limit wait and no shared limiter."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = Config()
+    config.api.use_gemini = False
+    config.api.rate_limit_wait = 25.0
+    service = TranslationService(config)
+    yield service
+    service.close()
+
+
+class TestTranslationService:
+    """Tests for retry handling."""
+
+    def test_rate_limit_backoff_scales_with_rate_limit_wait(self, service, monkeypatch):
+        """Throttled retries should wait on the scale of rate_limit_wait, capped at a multiple."""
+        ranges = []
+
+        def uniform(low, high):
+            ranges.append((low, high))
+            return high
+
+        monkeypatch.setattr(rate_limiter.random, "uniform", uniform)
+        response = httpx.Response(429, request=httpx.Request("POST", "https://api.test"))
+        error = RateLimitError("rate limited", response=response, body=None)
+
+        delays = [service._retry_delay("OpenAI", error, attempt, 5) for attempt in range(1, 5)]
+
+        assert ranges == [(0.0, 25.0), (0.0, 50.0), (0.0, 100.0), (0.0, 100.0)]
+        assert delays == [(high, False) for _low, high in ranges]
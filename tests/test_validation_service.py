@@ -1,125 +1,138 @@
 """Tests for ValidationService."""
 
+import pytest
+
+from models import Segment
+from utils import PlaceholderManager
 from validation_service import ValidationService
 
+# (segment fixture, translated text, valid, missing tokens, out of order)
+CASES = [
+    pytest.param(
+        "sample_segment",
+        "Bem-vindo ao jogo!",
+        True,
+        (),
+        False,
+        id="plain_text",
+    ),
+    pytest.param(
+        "segment_with_var",
+        "Olá, __VAR0__! Você tem __VAR1__ moedas.",
+        True,
+        (),
+        False,
+        id="preserved_tokens",
+    ),
+    pytest.param(
+        "segment_with_var",
+        "Olá, __VAR0__! Você tem moedas.",
+        False,
+        ("__VAR1__",),
+        False,
+        id="missing_token",
+    ),
+    pytest.param(
+        "segment_with_var",
+        "Você tem __VAR1__ moedas, __VAR0__!",
+        False,
+        (),
+        True,
+        id="tokens_out_of_order",
+    ),
+    pytest.param(
+        "segment_with_tags",
+        "Pressione __TAG0__Iniciar__TAG1__ para começar.",
+        True,
+        (),
+        False,
+        id="tags",
+    ),
+    pytest.param(
+        "segment_with_mixed",
+        "__TAG0____VAR0____TAG1__ marcou __VAR1__ pontos!",
+        True,
+        (),
+        False,
+        id="mixed_placeholders",
+    ),
+    pytest.param(
+        "segment_with_var",
+        "Olá! Você tem moedas.",
+        False,
+        ("__VAR0__", "__VAR1__"),
+        False,
+        id="all_tokens_missing",
+    ),
+]
+
 
 class TestValidationService:
     """Tests for translation validation."""
 
-    def test_validate_plain_text(self, sample_segment):
-        """Plain text without placeholders should validate successfully."""
-        translated = "Bem-vindo ao jogo!"
-
+    @pytest.mark.parametrize(
+        ("fixture_name", "translated", "valid", "missing", "out_of_order"),
+        CASES,
+    )
+    def test_validate_translation(
+        self, request, fixture_name, translated, valid, missing, out_of_order
+    ):
+        """Reports should flag missing and reordered tokens, and pass everything else."""
         report = ValidationService.validate_translation(
-            segment=sample_segment,
+            segment=request.getfixturevalue(fixture_name),
             translated_text=translated,
-            placeholder_map={},
         )
 
-        assert report.is_valid is True
-        assert report.missing_tokens == []
-        assert report.out_of_order is False
-
-    def test_validate_with_preserved_tokens(self, segment_with_var):
-        """Translation with all tokens preserved should validate."""
-        # Simulate protected text after translation
-        translated = "Olá, __VAR0__! Você tem __VAR1__ moedas."
-        placeholder_map = {
-            "__VAR0__": "{[player_name]}",
-            "__VAR1__": "{[coins]}",
-        }
+        expected = (valid, missing, out_of_order)
+        assert (report.is_valid, report.missing_tokens, report.out_of_order) == expected
 
-        report = ValidationService.validate_translation(
-            segment=segment_with_var,
-            translated_text=translated,
-            placeholder_map=placeholder_map,
-        )
+    def test_validate_batch(self, request):
+        """A batch call should return the same reports as one call per translation."""
+        cases = [case.values for case in CASES]
 
-        assert report.is_valid is True
-
-    def test_validate_missing_token(self, segment_with_var):
-        """Translation missing a token should fail validation."""
-        # Missing __VAR1__ (coins)
-        translated = "Olá, __VAR0__! Você tem moedas."
-        placeholder_map = {
-            "__VAR0__": "{[player_name]}",
-            "__VAR1__": "{[coins]}",
-        }
-
-        report = ValidationService.validate_translation(
-            segment=segment_with_var,
-            translated_text=translated,
-            placeholder_map=placeholder_map,
+        reports = ValidationService.validate_batch(
+            (request.getfixturevalue(fixture_name), translated)
+            for fixture_name, translated, *_expected in cases
         )
 
-        assert report.is_valid is False
-        assert "__VAR1__" in report.missing_tokens
-
-    def test_validate_tokens_out_of_order(self, segment_with_var):
-        """Translation with tokens in wrong order should fail."""
-        # Tokens swapped: VAR1 before VAR0
-        translated = "Você tem __VAR1__ moedas, __VAR0__!"
-        placeholder_map = {
-            "__VAR0__": "{[player_name]}",
-            "__VAR1__": "{[coins]}",
-        }
+        assert len(reports) == len(cases)
+        for report, (_fixture, _text, *expected) in zip(reports, cases, strict=True):
+            actual = [report.is_valid, report.missing_tokens, report.out_of_order]
+            assert actual == expected
 
+    def test_validate_plain_text_reports_stray_tokens(self, sample_segment):
+        """Tokens in the translation of a tokenless source should be reported, not rejected."""
         report = ValidationService.validate_translation(
-            segment=segment_with_var,
-            translated_text=translated,
-            placeholder_map=placeholder_map,
-        )
-
-        assert report.is_valid is False
-        assert report.out_of_order is True
-
-    def test_validate_with_tags(self, segment_with_tags):
-        """Translation with HTML tags should validate correctly."""
-        translated = "Pressione __TAG0__Iniciar__TAG1__ para começar."
-        placeholder_map = {
-            "__TAG0__": "<b>",
-            "__TAG1__": "</b>",
-        }
-
-        report = ValidationService.validate_translation(
-            segment=segment_with_tags,
-            translated_text=translated,
-            placeholder_map=placeholder_map,
+            segment=sample_segment,
+            translated_text="Bem-vindo __VAR0__!",
         )
 
         assert report.is_valid is True
+        assert report.source_tokens == ()
+        assert report.target_tokens == ("__VAR0__",)
 
-    def test_validate_mixed_placeholders(self, segment_with_mixed):
-        """Translation with mixed vars and tags should validate."""
-        translated = "__TAG0____VAR0____TAG1__ marcou __VAR1__ pontos!"
-        placeholder_map = {
-            "__VAR0__": "{[player]}",
-            "__VAR1__": "{[points]}",
-            "__TAG0__": "<player>",
-            "__TAG1__": "</player>",
-        }
+    def test_validate_with_source_token_map(self, segment_with_mixed):
+        """A protect() map passed as source_token_map should supply the source tokens."""
+        _protected, token_map = PlaceholderManager.protect(segment_with_mixed.source_text)
 
         report = ValidationService.validate_translation(
             segment=segment_with_mixed,
-            translated_text=translated,
-            placeholder_map=placeholder_map,
+            translated_text="__TAG0____VAR0____TAG1__ marcou __VAR1__ pontos!",
+            source_token_map=token_map,
         )
 
         assert report.is_valid is True
+        assert report.source_tokens == ("__TAG0__", "__VAR0__", "__TAG1__", "__VAR1__")
 
-    def test_validate_all_tokens_missing(self, segment_with_var):
-        """Translation with all tokens missing should fail."""
-        translated = "Olá! Você tem moedas."
-        placeholder_map = {
-            "__VAR0__": "{[player_name]}",
-            "__VAR1__": "{[coins]}",
-        }
-
-        report = ValidationService.validate_translation(
-            segment=segment_with_var,
-            translated_text=translated,
-            placeholder_map=placeholder_map,
+    def test_repeated_check_keeps_each_segment_key(self, segment_with_var):
+        """Segments sharing a source and translation should each get their own report."""
+        twin = Segment(
+            sheet="MATCH", row_idx=99, key="twin_greeting", source_text=segment_with_var.source_text
         )
+        translated = "Olá, __VAR0__! Você tem moedas."
+
+        first = ValidationService.validate_translation(segment_with_var, translated)
+        second = ValidationService.validate_translation(twin, translated)
 
-        assert report.is_valid is False
-        assert len(report.missing_tokens) == 2
+        assert (first.key, second.key) == ("player_greeting", "twin_greeting")
+        assert first.missing_tokens == second.missing_tokens == ("__VAR1__",)
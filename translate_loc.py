@@ -14,10 +14,13 @@ Features:
 - Configurable AI prompts for domain-specific translations
 """
 
+import asyncio
 import logging
+import logging.handlers
+import queue
 import sys
-from pathlib import Path
 from datetime import datetime
+from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -28,114 +31,214 @@ from rich.text import Text
 
 from config import Config
 from localization_engine import LocalizationEngine
+from rate_limiter import RateLimiter
+from tm_cache import TranslationMemoryCache
+from translation_service import TranslationService
 
-console = Console()
+# Writes the queued log records to the log file; started by setup_logging()
+_log_listener: logging.handlers.QueueListener | None = None
 
 
 def setup_logging(config: Config) -> str:
     """Configure logging for the application. Returns run_id."""
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = config.logging.logs_dir / f"mt_run_{run_id}.log"
-    
+
     # Create formatters
     detailed_formatter = logging.Formatter(
         "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
     )
-    
+
     # File handler: detailed logs (all levels)
     file_handler = logging.FileHandler(log_file, encoding="utf-8")
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
-    
+
+    # Loggers only enqueue records; a background thread writes them to the file,
+    # so translation work never waits on log I/O
+    global _log_listener
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+
     # Configure root logger (file only, no console output for logs)
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(file_handler)
-    
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
     # Suppress verbose third-party loggers
     logging.getLogger("urllib3").setLevel(logging.ERROR)
     logging.getLogger("google").setLevel(logging.ERROR)
     logging.getLogger("openai").setLevel(logging.ERROR)
-    
+
     return run_id
 
 
+def event_loop_factory():
+    """uvloop's event loop when the "fast" extra installed it, else None for asyncio's own."""
+    try:
+        import uvloop  # optional, from the "fast" extra; not available on Windows
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def print_header(console: Console, config: Config) -> None:
+    """Show the run's configuration: as panels on a terminal, as plain lines otherwise."""
+    provider = "Gemini" if config.api.use_gemini else "OpenAI"
+    if not console.is_terminal:
+        # Piped or redirected output (CI, cron): skip laying out panels nobody sees
+        print("Localization Translation Tool")
+        print(f"Target Language: {config.translation.target_lang}")
+        print(f"Sheets to Translate: {', '.join(config.translation.sheets_to_translate)}")
+        print(f"Batch Size: {config.translation.batch_size}")
+        print(f"API Provider: {provider}")
+        print("Config File: settings.ini")
+        return
+
+    # Display nice header
+    title = Text("Localization Translation Tool", style="bold cyan")
+    console.print(Panel(title, border_style="cyan"))
+
+    # Display configuration
+    config_text = Text()
+    config_text.append("Target Language: ", style="bold")
+    config_text.append(f"{config.translation.target_lang}\n", style="green")
+    config_text.append("Sheets to Translate: ", style="bold")
+    config_text.append(f"{', '.join(config.translation.sheets_to_translate)}\n", style="green")
+    config_text.append("Batch Size: ", style="bold")
+    config_text.append(f"{config.translation.batch_size}\n", style="green")
+    config_text.append("API Provider: ", style="bold")
+    config_text.append(f"{provider}\n", style="green")
+    config_text.append("Config File: ", style="dim")
+    config_text.append("settings.ini", style="cyan")
+
+    console.print(Panel(config_text, title="Configuration", border_style="yellow"))
+
+    # Show how to modify settings
+    info_text = Text()
+    info_text.append("Tip: ", style="bold yellow")
+    info_text.append("Edit ", style="dim")
+    info_text.append("settings.ini", style="cyan")
+    info_text.append(" to change configuration", style="dim")
+    console.print(Panel(info_text, border_style="dim yellow"))
+
+
+def print_summary(console: Console, run_id: str) -> None:
+    """Show where the run's outputs were written."""
+    if not console.is_terminal:
+        print("Translation pipeline completed successfully!")
+        print(f"Report file: logs/mt_report_{run_id}.html")
+        print(f"Log file: logs/mt_run_{run_id}.log")
+        print(f"Status file: logs/mt_keys_{run_id}.csv")
+        return
+
+    success_text = Text()
+    success_text.append("Translation pipeline completed successfully!\n", style="bold green")
+    success_text.append("Report file: ", style="dim")
+    success_text.append(f"logs/mt_report_{run_id}.html\n", style="cyan")
+    success_text.append("Log file: ", style="dim")
+    success_text.append(f"logs/mt_run_{run_id}.log\n", style="cyan")
+    success_text.append("Status file: ", style="dim")
+    success_text.append(f"logs/mt_keys_{run_id}.csv", style="cyan")
+
+    console.print(Panel(success_text, border_style="green"))
+
+
+async def run_engine(config: Config, keys_log_path: Path, **engine_args) -> None:
+    """Run the pipeline on a provider client opened and closed on the running loop.
+
+    Every API request of the run reuses the client's pooled connections.
+    """
+    async_client = TranslationService.create_async_client(config)
+    try:
+        engine = LocalizationEngine(
+            config, keys_log_path, async_client=async_client, **engine_args
+        )
+        await engine.run_async()
+    finally:
+        await TranslationService.aclose_client(async_client)
+
+
 def main() -> int:
     """Main entry point."""
+    # Built on first run rather than at import; it probes the terminal
+    console = Console()
+    keys_log = None
+    translation_cache = None
     try:
         # Load configuration
         config = Config.from_env()
-        
+
         # Setup logging
         run_id = setup_logging(config)
         logger = logging.getLogger(__name__)
-        
-        # Display nice header
-        title = Text("Localization Translation Tool", style="bold cyan")
-        console.print(Panel(title, border_style="cyan"))
-        
-        # Display configuration
-        config_text = Text()
-        config_text.append(f"Target Language: ", style="bold")
-        config_text.append(f"{config.translation.target_lang}\n", style="green")
-        config_text.append(f"Sheets to Translate: ", style="bold")
-        config_text.append(f"{', '.join(config.translation.sheets_to_translate)}\n", style="green")
-        config_text.append(f"Batch Size: ", style="bold")
-        config_text.append(f"{config.translation.batch_size}\n", style="green")
-        config_text.append(f"API Provider: ", style="bold")
-        config_text.append(f"{'Gemini' if config.api.use_gemini else 'OpenAI'}\n", style="green")
-        config_text.append(f"Config File: ", style="dim")
-        config_text.append(f"settings.ini", style="cyan")
-        
-        console.print(Panel(config_text, title="Configuration", border_style="yellow"))
-        
-        # Show how to modify settings
-        info_text = Text()
-        info_text.append("Tip: ", style="bold yellow")
-        info_text.append("Edit ", style="dim")
-        info_text.append("settings.ini", style="cyan")
-        info_text.append(" to change configuration", style="dim")
-        console.print(Panel(info_text, border_style="dim yellow"))
-        
-        # Create run log
+
+        print_header(console, config)
+
+        # Create run log: one buffered handle for every status row of the run
         keys_log_path = config.logging.logs_dir / f"mt_keys_{run_id}.csv"
-        
+        keys_log = LocalizationEngine.open_keys_log(keys_log_path)
+
         logger.info("=" * 80)
         logger.info(f"Target Language: {config.translation.target_lang}")
         logger.info(f"Sheets to Translate: {config.translation.sheets_to_translate}")
         logger.info("=" * 80)
-        
-        # Run translation pipeline
-        engine = LocalizationEngine(config, keys_log_path)
-        engine.run()
-        
+
+        # Paces every API request of the run, before any is rejected as rate limited
+        rate_limiter = RateLimiter(
+            config.translation.batch_cooldown_seconds, config.api.tokens_per_minute
+        )
+
+        # Translations of earlier runs, served instead of repeating their requests
+        translation_cache = TranslationMemoryCache(config.cache.translation_memory_path)
+        translation_cache.load()
+
+        # Run translation pipeline: its API requests share one event loop and
+        # up to max_concurrent_batches of them are in flight at once
+        asyncio.run(
+            run_engine(
+                config,
+                keys_log_path,
+                rate_limiter=rate_limiter,
+                translation_cache=translation_cache,
+                keys_log=keys_log,
+                console=console,
+            ),
+            loop_factory=event_loop_factory(),
+        )
+
         # Display success message
-        success_text = Text()
-        success_text.append("Translation pipeline completed successfully!\n", style="bold green")
-        success_text.append(f"Report file: ", style="dim")
-        success_text.append(f"logs/mt_report_{run_id}.html\n", style="cyan")
-        success_text.append(f"Log file: ", style="dim")
-        success_text.append(f"logs/mt_run_{run_id}.log\n", style="cyan")
-        success_text.append(f"Status file: ", style="dim")
-        success_text.append(f"logs/mt_keys_{run_id}.csv", style="cyan")
-        
-        console.print(Panel(success_text, border_style="green"))
-        
+        print_summary(console, run_id)
+
         logger.info("=" * 80)
         logger.info("Translation pipeline completed successfully")
         logger.info("=" * 80)
         return 0
-    
+
     except KeyboardInterrupt:
         console.print("\n[bold red] Translation interrupted by user[/bold red]")
         logger.warning("Translation interrupted by user")
         return 130
-    
+
     except Exception as e:
         console.print(f"\n[bold red] Fatal error: {e}[/bold red]")
         logger.error(f"Fatal error: {e}", exc_info=True)
         return 1
 
+    finally:
+        # The keys log belongs to main, which closes it however the run ended
+        if keys_log is not None:
+            keys_log.close()
+        # So does the translation memory, committing what the run added
+        if translation_cache is not None:
+            translation_cache.close()
+        # Write out the records still queued before the process exits
+        if _log_listener is not None:
+            _log_listener.stop()
+
 
 if __name__ == "__main__":
     sys.exit(main())